@@ -0,0 +1,82 @@
+"""TerminalStore with an action log: memory the log holds and time for
+state_at to rebuild a random state, for a range of snapshot intervals. The
+largest interval is past the end of the session, so every seek replays from
+the first state. Dispatch cost is given next to a store that logs nothing."""
+import random
+import time
+import tracemalloc
+from pyt import actions
+from pyt import config
+from pyt.Logger import Logger
+from pyt.main.run_terminal.TerminalStore import TerminalStore
+
+n_bytes = 1 << 20
+chunk_size = 64
+snapshot_intervals = 10, 100, 1000, 1 << 20
+n_seeks = 20
+rand = random.Random(0)
+data = b''.join(
+    bytes(rand.randrange(0x20, 0x7f) for _ in range(rand.randrange(80)))
+    + b'\r\n'
+    for _ in range(n_bytes // 40)
+)[:n_bytes]
+chunks = [
+    actions.PutByteSequence(data[i:i + chunk_size])
+    for i in range(0, len(data), chunk_size)
+]
+
+
+def make_store(snapshot_interval):
+    store = TerminalStore(action_log_size=snapshot_interval and len(chunks),
+                          snapshot_interval=snapshot_interval or 1)
+    store.unsub_log_state()
+    return store
+
+
+def record(snapshot_interval):
+    store = make_store(snapshot_interval)
+    start = time.perf_counter()
+
+    for chunk in chunks:
+        store.dispatch(chunk)
+
+    elapsed = (time.perf_counter() - start) / len(chunks)
+    # Once more to count what the store holds on to, as tracing slows
+    # everything down
+    store = make_store(snapshot_interval)
+    tracemalloc.start()
+
+    for chunk in chunks:
+        store.dispatch(chunk)
+
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return store, elapsed, memory
+
+
+def seek(store):
+    indices = [rand.randrange(len(chunks) + 1) for _ in range(n_seeks)]
+    start = time.perf_counter()
+
+    for index in indices:
+        store.state_at(index)
+
+    return (time.perf_counter() - start) / n_seeks
+
+
+def main():
+    Logger.disabled = True
+    print(f'{config.width}x{config.height}, {len(chunks)} reads of '
+          f'{chunk_size} bytes')
+    _, elapsed, memory = record(0)
+    print(f'no log: {elapsed * 1e6:.1f} us/dispatch, {memory >> 10} KiB')
+
+    for snapshot_interval in snapshot_intervals:
+        store, elapsed, memory = record(snapshot_interval)
+        print(f'snapshot_interval={snapshot_interval}: '
+              f'{elapsed * 1e6:.1f} us/dispatch, {memory >> 10} KiB, '
+              f'{seek(store) * 1e3:.2f} ms/state_at')
+
+
+if __name__ == '__main__':
+    main()
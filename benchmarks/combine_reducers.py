@@ -0,0 +1,59 @@
+"""Dispatch cost for the nested redux_example State, for actions that change
+a field deep down and actions that no reducer handles. The CombineReducers
+slices that State merges are also reduced on their own."""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..',
+                                'redux_example'))
+
+import actions  # noqa: E402
+import redux  # noqa: E402
+from State import State  # noqa: E402
+
+inputs = {
+    'toggle': [
+        actions.ToggleGeometryOption(actions.GeometryOptions.LOCALS),
+    ],
+    'shape': [
+        actions.Shape.UpdateShapeName(actions.ShapeNames.SQUARE),
+        actions.Shape.UpdateShapeName(actions.ShapeNames.KNOT),
+    ],
+    'unhandled': [object()],
+}
+
+
+def bench(actions_list, n_repeats=20000):
+    store = redux.Store(State())
+    start = time.perf_counter()
+
+    for _ in range(n_repeats):
+        for action in actions_list:
+            store.dispatch(action)
+
+    return (time.perf_counter() - start) / (n_repeats * len(actions_list))
+
+
+def bench_slice(reducer, actions_list, n_repeats=20000):
+    data = reducer()
+    start = time.perf_counter()
+
+    for _ in range(n_repeats):
+        for action in actions_list:
+            data.reduce(action)
+
+    return (time.perf_counter() - start) / (n_repeats * len(actions_list))
+
+
+def main():
+    for name, actions_list in inputs.items():
+        print(f'{name}: {bench(actions_list) * 1e6:.2f} us/dispatch')
+
+        for slice_name, (reducer, _) in State.reducers.items():
+            slice_time = bench_slice(reducer, actions_list)
+            print(f'  {slice_name}: {slice_time * 1e6:.2f} us/reduce')
+
+
+if __name__ == '__main__':
+    main()
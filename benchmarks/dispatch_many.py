@@ -0,0 +1,58 @@
+"""Cost of a burst of small PTY reads through a TerminalStore that queues
+every state it is told about, dispatched one by one against as one batch."""
+import queue
+import random
+import threading
+import time
+from pyt import actions
+from pyt import config
+from pyt.Logger import Logger
+from pyt.main.run_terminal.TerminalStore import TerminalStore
+
+rand = random.Random(0)
+chunk_sizes = 16, 256, 4096
+
+
+def printable(n_bytes):
+    return bytes(rand.randrange(0x20, 0x7f) for _ in range(n_bytes))
+
+
+data = b'\r\n'.join(printable(config.width // 2) for _ in range(2000))
+
+
+def chunks(chunk_size):
+    return [
+        actions.PutByteSequence(data[i:i + chunk_size])
+        for i in range(0, len(data), chunk_size)
+    ]
+
+
+def bench(chunk_size, batch):
+    terminal_queue = queue.Queue()
+    store = TerminalStore(terminal_queue, threading.Event(), fps=0)
+    burst = chunks(chunk_size)
+    start = time.perf_counter()
+
+    if batch:
+        store.dispatch_many(burst)
+    else:
+        for action in burst:
+            store.dispatch(action)
+
+    elapsed = time.perf_counter() - start
+    return len(data) / elapsed, terminal_queue.qsize()
+
+
+def main():
+    Logger.disabled = True
+
+    for chunk_size in chunk_sizes:
+        for batch in False, True:
+            throughput, n_states = bench(chunk_size, batch)
+            name = 'dispatch_many' if batch else 'dispatch'
+            print(f'{chunk_size} B chunks, {name}: '
+                  f'{throughput / 2 ** 10:.0f} KiB/s, {n_states} states')
+
+
+if __name__ == '__main__':
+    main()
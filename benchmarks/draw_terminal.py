@@ -0,0 +1,165 @@
+"""X requests, bytes and time per frame for Connection.draw_terminal, drawing
+a cell per ImageText8, a span per ImageText8, and spans after moving the
+scrolled picture up with CopyArea. Each frame is drawn into the pixmap and
+then shown with one more CopyArea.
+
+Request counts and sizes are worked out without a server. Wall-clock times
+are measured against the X server in $DISPLAY (e.g. Xvfb) when there is one,
+waiting for a round trip after each frame so the server has done the work."""
+import os
+import random
+import time
+from pyt import actions
+from pyt import config
+from pyt.Logger import Logger
+from pyt.main.Connection import Connection, changed_spans, encode_cells
+from pyt.main.run_terminal.TerminalStore.Terminal import Terminal
+
+rand = random.Random(0)
+
+
+def printable(n_bytes):
+    return bytes(rand.randrange(0x20, 0x7f) for _ in range(n_bytes))
+
+
+def text_lines(n_lines):
+    return b''.join(
+        printable(rand.randrange(config.width // 4, config.width)) + b'\r\n'
+        for _ in range(n_lines))
+
+
+def frames(*chunks):
+    terminal = Terminal()
+    states = []
+
+    for chunk in chunks:
+        terminal = terminal.reduce(actions.PutByteSequence(chunk))
+        states.append(terminal)
+
+    return states
+
+
+# Each scenario is a list of states drawn one after the other, the first
+# one from scratch as after an Expose
+scenarios = {
+    'repaint': frames(text_lines(config.height)),
+    'typing': frames(text_lines(config.height), *[b'x'] * 100),
+    'scrolling': frames(*(text_lines(1) for _ in range(100))),
+    'flood': frames(*(text_lines(10) for _ in range(100))),
+}
+
+
+def cell_spans(row, drawn_row=None):
+    for x, code_point in enumerate(row):
+        if drawn_row is None or code_point != drawn_row[x]:
+            yield x, x + 1
+
+
+def request_size(text):
+    return 16 + (len(text) + 3) // 4 * 4
+
+
+def count_requests(states, spans, blit):
+    n_requests = n_bytes = 0
+    drawn_rows = []
+    drawn_scroll_count = 0
+
+    for state in states:
+        n_scrolled = state.grid.scroll_count - drawn_scroll_count
+        drawn_scroll_count = state.grid.scroll_count
+        changed = False
+
+        if len(drawn_rows) != config.height:
+            drawn_rows = [None] * config.height
+        elif blit and 0 < n_scrolled < config.height:
+            n_requests += 1
+            n_bytes += 28
+            drawn_rows[:-n_scrolled] = drawn_rows[n_scrolled:]
+            changed = True
+
+        for y, row in enumerate(state.grid):
+            if row != drawn_rows[y]:
+                for start, end in spans(row, drawn_rows[y]):
+                    n_requests += 1
+                    n_bytes += request_size(encode_cells(row[start:end]))
+
+                drawn_rows[y] = row[:]
+                changed = True
+
+        if changed:
+            n_requests += 1
+            n_bytes += 28
+
+    return n_requests / len(states), n_bytes / len(states)
+
+
+class BenchConnection(Connection):
+    def __init__(self, *args, spans=changed_spans, blit=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.spans = spans
+        self.blit = blit
+        self.states = []
+
+    def redraw_window(self):
+        return self
+
+    def update_terminal(self):
+        self.terminal = self.states.pop(0)
+        return self
+
+    def scroll_drawn_rows(self, n_lines, n_cols):
+        if self.blit:
+            return super().scroll_drawn_rows(n_lines, n_cols)
+
+        return self
+
+    def draw_row(self, y, row, drawn_row=None):
+        for start, end in self.spans(row, drawn_row):
+            self.put_text(start, y, encode_cells(row[start:end]))
+
+        return self
+
+    def bench(self, states, n_repeats=10):
+        best = float('inf')
+
+        for _ in range(n_repeats):
+            self.invalidate()
+            self.states = list(states)
+            start = time.perf_counter()
+
+            while self.states:
+                self.draw_terminal()
+                self.core.GetInputFocus().reply()
+
+            best = min(best, time.perf_counter() - start)
+
+        return best / len(states)
+
+
+def main():
+    Logger.disabled = True
+    methods = {
+        'cell': (cell_spans, False),
+        'span': (changed_spans, False),
+        'blit': (changed_spans, True),
+    }
+
+    for name, states in scenarios.items():
+        for method, (spans, blit) in methods.items():
+            n_requests, n_bytes = count_requests(states, spans, blit)
+            print(f'{name} {method}: {n_requests:.1f} requests, '
+                  f'{n_bytes:.0f} bytes/frame')
+
+    if not os.environ.get('DISPLAY'):
+        print('no $DISPLAY, skipping wall-clock times')
+        return
+
+    for method, (spans, blit) in methods.items():
+        with BenchConnection(spans=spans, blit=blit) as connection:
+            for name, states in scenarios.items():
+                frame_time = connection.bench(states)
+                print(f'{name} {method}: {frame_time * 1e3:.3f} ms/frame')
+
+
+if __name__ == '__main__':
+    main()
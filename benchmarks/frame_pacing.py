@@ -0,0 +1,56 @@
+"""States handed from run_terminal to the window, and the time to get through
+a burst of output, with every state queued against frames paced to
+config.fps."""
+import multiprocessing
+import threading
+import time
+from pyt import actions
+from pyt import config
+from pyt.Logger import Logger
+from pyt.main.run_terminal import run_terminal
+
+chunk = b'flood of output\r\n' * 64
+n_chunks = 2000
+
+
+def drain(terminal_queue, counts):
+    while True:
+        terminal_queue.get()
+        counts[0] += 1
+
+
+def bench(fps):
+    config.fps = fps
+    terminal_queue = multiprocessing.Queue()
+    counts = [0]
+    threading.Thread(target=drain, args=(terminal_queue, counts),
+                     daemon=True).start()
+    action_queue = multiprocessing.Queue()
+    write_queue = multiprocessing.Queue()
+    quit_event = multiprocessing.Event()
+
+    for _ in range(n_chunks):
+        action_queue.put(actions.PutByteSequence(chunk))
+
+    start = time.perf_counter()
+    proc = run_terminal(terminal_queue, multiprocessing.Event(), action_queue,
+                        write_queue, quit_event)
+    action_queue.put(actions.Quit())
+    proc.join()
+    elapsed = time.perf_counter() - start
+    # Let the drain thread catch up with what was queued
+    time.sleep(.5)
+    return counts[0], elapsed
+
+
+def main():
+    Logger.disabled = True
+
+    for fps in 0, 60:
+        n_states, elapsed = bench(fps)
+        print(f'fps={fps}: {n_states} states for {n_chunks} chunks, '
+              f'{elapsed:.2f} s')
+
+
+if __name__ == '__main__':
+    main()
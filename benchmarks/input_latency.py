@@ -0,0 +1,75 @@
+"""Keystroke and Quit latency while run_terminal is flooded with output,
+comparing the action queue lane against the priority lanes."""
+import multiprocessing
+import threading
+import time
+from pyt import actions
+from pyt.main.run_terminal import run_terminal
+
+chunk = b'flood of output\r\n' * 64
+depths = 0, 1, 10
+
+
+def drain(queue):
+    while True:
+        queue.get()
+
+
+def start_terminal():
+    terminal_queue = multiprocessing.Queue()
+    threading.Thread(target=drain, args=(terminal_queue,), daemon=True).start()
+    action_queue = multiprocessing.Queue()
+    write_queue = multiprocessing.Queue()
+    quit_event = multiprocessing.Event()
+    proc = run_terminal(terminal_queue, multiprocessing.Event(), action_queue,
+                        write_queue, quit_event)
+    return proc, action_queue, write_queue, quit_event
+
+
+def flood(action_queue, depth):
+    for _ in range(depth):
+        action_queue.put(actions.PutByteSequence(chunk))
+
+
+def bench_keystroke(depth, priority):
+    proc, action_queue, write_queue, quit_event = start_terminal()
+    flood(action_queue, depth)
+    start = time.perf_counter()
+
+    if priority:
+        write_queue.put(b'a')
+    else:
+        action_queue.put(actions.KeyboardInput('a'))
+
+    write_queue.get()
+    elapsed = time.perf_counter() - start
+    quit_event.set()
+    action_queue.put(actions.Quit())
+    proc.join()
+    return elapsed
+
+
+def bench_quit(depth, priority):
+    proc, action_queue, write_queue, quit_event = start_terminal()
+    flood(action_queue, depth)
+    start = time.perf_counter()
+
+    if priority:
+        quit_event.set()
+
+    action_queue.put(actions.Quit())
+    proc.join()
+    return time.perf_counter() - start
+
+
+def main():
+    for name, bench in [('keystroke', bench_keystroke), ('quit', bench_quit)]:
+        for depth in depths:
+            before = bench(depth, False) * 1000
+            after = bench(depth, True) * 1000
+            print(f'{name} behind {depth} chunks: action queue {before:.2f} ms'
+                  f', priority lane {after:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Cost of a new version with one item changed, of reading an item and of
+comparing two versions that differ in one item, for PersistentMap and
+PersistentVector against copying a dict or list."""
+import random
+import time
+import redux
+
+sizes = 10, 1000, 100_000
+n_ops = 2000
+rand = random.Random(0)
+
+
+def set_dict(data, key, value):
+    data = data.copy()
+    data[key] = value
+    return data
+
+
+def set_persistent(data, key, value):
+    return data.set(key, value)
+
+
+def make_dict(n):
+    return {str(i): i for i in range(n)}
+
+
+def make_list(n):
+    return list(range(n))
+
+
+kinds = {
+    'dict': (make_dict, set_dict, lambda n: str(rand.randrange(n))),
+    'PersistentMap': (
+        lambda n: redux.PersistentMap(make_dict(n)),
+        set_persistent,
+        lambda n: str(rand.randrange(n)),
+    ),
+    'list': (make_list, set_dict, lambda n: rand.randrange(n)),
+    'PersistentVector': (
+        lambda n: redux.PersistentVector(make_list(n)),
+        set_persistent,
+        lambda n: rand.randrange(n),
+    ),
+}
+
+
+def timed(func, args_list):
+    start = time.perf_counter()
+
+    for args in args_list:
+        func(*args)
+
+    return (time.perf_counter() - start) / len(args_list) * 1e6
+
+
+def bench(make, set_item, random_key, n):
+    data = make(n)
+    keys = [random_key(n) for _ in range(n_ops)]
+    set_time = timed(set_item, [(data, key, -1) for key in keys])
+    get_time = timed(type(data).__getitem__, [(data, key) for key in keys])
+    changed = [set_item(data, key, -1) for key in keys[:100]]
+    eq_time = timed(type(data).__eq__, [(data, other) for other in changed])
+    return set_time, get_time, eq_time
+
+
+def main():
+    for n in sizes:
+        for name, (make, set_item, random_key) in kinds.items():
+            set_time, get_time, eq_time = bench(make, set_item, random_key, n)
+            print(f'{n} items, {name}: set {set_time:.2f} us, '
+                  f'get {get_time:.2f} us, eq {eq_time:.2f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Cost of Push and Pop on redux_example's CombineReducersStack with stacks
+of growing depth."""
+import dataclasses
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..',
+                                'redux_example'))
+
+import redux  # noqa: E402
+from State import Stack  # noqa: E402
+
+depths = 10, 1000, 100_000
+
+
+def deep_state(depth):
+    state = Stack()
+    entry = Stack._stack_entry(**vars(state))
+    return dataclasses.replace(state, stack=type(state.stack)([entry] * depth))
+
+
+def bench(depth, n_repeats=1000):
+    state = deep_state(depth)
+    push = redux.stack_actions.Push()
+    pop = redux.stack_actions.Pop()
+    start = time.perf_counter()
+
+    for _ in range(n_repeats):
+        state.reduce(push).reduce(pop)
+
+    return (time.perf_counter() - start) / (2 * n_repeats)
+
+
+def main():
+    for depth in depths:
+        print(f'depth {depth}: {bench(depth) * 1e6:.1f} us/action')
+
+
+if __name__ == '__main__':
+    main()
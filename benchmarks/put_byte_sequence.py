@@ -0,0 +1,66 @@
+"""Throughput of Terminal.reduce for PutByteSequence on cat-like output.
+
+Every screenful starts with a cursor home so the numbers measure writing
+text and not scrolling."""
+import io
+import random
+import time
+from pyt import actions
+from pyt import config
+from pyt.main.run_terminal.TerminalStore.Terminal import Terminal
+
+size = 1 << 16
+rand = random.Random(0)
+home = b'\x1b[H'
+
+
+def printable(n_bytes):
+    return bytes(rand.randrange(0x20, 0x7f) for _ in range(n_bytes))
+
+
+def log_lines():
+    screens = []
+
+    while len(screens) * config.width * config.height < size:
+        lines = [
+            printable(rand.randrange(config.width // 4, config.width))
+            for _ in range(config.height - 1)
+        ]
+        screens.append(home + b'\r\n'.join(lines))
+
+    return b''.join(screens)
+
+
+def wrapped():
+    screen_size = config.width * config.height
+    return b''.join(
+        home + printable(screen_size)
+        for _ in range(size // screen_size)
+    )
+
+
+inputs = {
+    'log lines': log_lines(),
+    'wrapped': wrapped(),
+}
+
+
+def bench(data):
+    terminal = Terminal()
+    chunk_size = io.DEFAULT_BUFFER_SIZE
+    start = time.perf_counter()
+
+    for i in range(0, len(data), chunk_size):
+        terminal = terminal.reduce(
+            actions.PutByteSequence(data[i:i + chunk_size]))
+
+    return len(data) / (time.perf_counter() - start)
+
+
+def main():
+    for name, data in inputs.items():
+        print(f'{name}: {bench(data) / 2 ** 10:.1f} KiB/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""Per-character dispatch overhead of Terminal.put_code_point.
+
+Each input goes through put_code_point one code point at a time on a
+terminal whose screen never changes, so the time is spent in dispatch."""
+import time
+from pyt.Logger import Logger
+from pyt.main.run_terminal.TerminalStore.Terminal import Terminal
+
+n_repeats = 2000
+inputs = {
+    # SGR is ignored, so this is parsing only
+    'csi': '\x1b[1;32m\x1b[0m' * 10,
+    # OSC window title, collected and logged at BEL
+    'osc': '\x1b]0;user@host: ~/src/project\x07',
+    'cursor': '\x1b[H\r\x1b[1C\x08' * 10,
+}
+
+
+def bench(string):
+    terminal = Terminal()
+    code_points = list(map(ord, string)) * n_repeats
+    start = time.perf_counter()
+
+    for code_point in code_points:
+        terminal = terminal.put_code_point(code_point)
+
+    return (time.perf_counter() - start) / len(code_points)
+
+
+def main():
+    # Keep the log queue out of the measurement
+    Logger.disabled = True
+
+    for name, string in inputs.items():
+        print(f'{name}: {bench(string) * 1e9:.0f} ns/char')
+
+
+if __name__ == '__main__':
+    main()
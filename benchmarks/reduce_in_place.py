@@ -0,0 +1,63 @@
+"""TerminalStore.dispatch cost with and without reducing in place.
+
+'snapshot' is the in place store with a subscriber taking a snapshot after
+every dispatch, like queue_state does."""
+import random
+import time
+from pyt import actions
+from pyt import config
+from pyt.main.run_terminal.TerminalStore import TerminalStore
+
+n_bytes = 1 << 20
+sizes = (80, 24), (300, 100)
+chunk_sizes = 1, 64, 4096
+max_chunks = 20_000
+rand = random.Random(0)
+data = b''.join(
+    bytes(rand.randrange(0x20, 0x7f) for _ in range(rand.randrange(80)))
+    + b'\r\n'
+    for _ in range(n_bytes // 40)
+)[:n_bytes]
+
+
+def make_store(mode):
+    store = TerminalStore(in_place=mode != 'copy')
+    store.unsub_log_state()
+
+    if mode == 'snapshot':
+        store.subscribe(store.snapshot)
+
+    return store
+
+
+def bench(mode, chunk_size, n_repeats=3):
+    end = min(len(data), chunk_size * max_chunks)
+    chunks = [
+        actions.PutByteSequence(data[i:i + chunk_size])
+        for i in range(0, end, chunk_size)
+    ]
+    times = []
+
+    for _ in range(n_repeats):
+        store = make_store(mode)
+        start = time.perf_counter()
+
+        for chunk in chunks:
+            store.dispatch(chunk)
+
+        times.append((time.perf_counter() - start) / len(chunks))
+
+    return min(times)
+
+
+def main():
+    for config.width, config.height in sizes:
+        for chunk_size in chunk_sizes:
+            for mode in 'copy', 'in place', 'snapshot':
+                seconds = bench(mode, chunk_size)
+                print(f'{config.width}x{config.height}, {chunk_size} byte '
+                      f'reads, {mode}: {seconds * 1e6:.1f} us/dispatch')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Cost of the screen operations: scrolling, erasing and drawing.
+
+Scrolling and erasing go through Terminal.reduce. Drawing walks every cell
+the way Connection.draw_terminal does, without the X calls."""
+import io
+import random
+import time
+from pyt import actions
+from pyt import config
+from pyt.Logger import Logger
+from pyt.main.run_terminal.TerminalStore.Terminal import Terminal
+
+rand = random.Random(0)
+
+
+def printable(n_bytes):
+    return bytes(rand.randrange(0x20, 0x7f) for _ in range(n_bytes))
+
+
+def scroll():
+    return b'\r\n'.join(
+        printable(rand.randrange(config.width // 4, config.width))
+        for _ in range(500)
+    )
+
+
+def erase():
+    # Fill the screen, then erase it line by line and all at once
+    return (
+        printable(config.width * config.height)
+        + b''.join(
+            b'\x1b[%dH\x1b[K\x1b[%dH\x1b[2K\x1b[%dX' % (y, y, config.width)
+            for y in range(1, config.height + 1))
+        + b'\x1b[2J'
+    ) * 20
+
+
+inputs = {
+    'scroll': scroll(),
+    'erase': erase(),
+}
+
+
+def bench(data):
+    terminal = Terminal()
+    chunk_size = io.DEFAULT_BUFFER_SIZE
+    start = time.perf_counter()
+
+    for i in range(0, len(data), chunk_size):
+        terminal = terminal.reduce(
+            actions.PutByteSequence(data[i:i + chunk_size]))
+
+    return len(data) / (time.perf_counter() - start), terminal
+
+
+def bench_draw(terminal, n_repeats=100):
+    start = time.perf_counter()
+
+    for _ in range(n_repeats):
+        for y, row in enumerate(terminal.grid):
+            for x, code_point in enumerate(row):
+                if code_point:
+                    pass
+
+    return (time.perf_counter() - start) / n_repeats
+
+
+def main():
+    Logger.disabled = True
+
+    terminals = {}
+
+    for name, data in inputs.items():
+        throughput, terminals[name] = bench(data)
+        print(f'{name}: {throughput / 2 ** 10:.1f} KiB/s')
+
+    draw_time = bench_draw(terminals['scroll'])
+    print(f'draw: {draw_time * 1e3:.2f} ms/frame')
+
+
+if __name__ == '__main__':
+    main()
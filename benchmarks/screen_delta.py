@@ -0,0 +1,65 @@
+"""Pickled size and pickling time of what run_terminal sends the window after
+an action: the whole Terminal against the ScreenDelta of what changed."""
+import pickle
+import random
+import time
+from pyt import actions
+from pyt import config
+from pyt.Logger import Logger
+from pyt.main.run_terminal.TerminalStore.ScreenDelta import ScreenDelta
+from pyt.main.run_terminal.TerminalStore.Terminal import Terminal
+
+rand = random.Random(0)
+sizes = (80, 24), (300, 100)
+
+
+def printable(n_bytes):
+    return bytes(rand.randrange(0x20, 0x7f) for _ in range(n_bytes))
+
+
+def inputs():
+    return {
+        'typing': b'x',
+        'line': printable(config.width // 2) + b'\r\n',
+        'page': b'\x1b[H' + printable(config.width * config.height),
+    }
+
+
+def bench(terminal, action, n_repeats=200):
+    terminal.take_damage()
+    terminal = terminal.reduce(action)
+    results = []
+
+    for make_message in (
+            lambda: terminal.snapshot(),
+            lambda: ScreenDelta.from_terminal(
+                terminal, terminal.grid.dirty_rows()),
+    ):
+        start = time.perf_counter()
+
+        for _ in range(n_repeats):
+            message = pickle.dumps(make_message())
+
+        elapsed = (time.perf_counter() - start) / n_repeats
+        results.append((len(message), elapsed))
+
+    return results
+
+
+def main():
+    Logger.disabled = True
+
+    for config.width, config.height in sizes:
+        terminal = Terminal().reduce(actions.PutByteSequence(
+            printable(config.width * config.height)))
+
+        for name, data in inputs().items():
+            (full_size, full_time), (delta_size, delta_time) = bench(
+                terminal, actions.PutByteSequence(data))
+            print(f'{config.width}x{config.height} {name}: '
+                  f'terminal {full_size} B {full_time * 1e6:.0f} us, '
+                  f'delta {delta_size} B {delta_time * 1e6:.0f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Scroll a million lines through terminals of different sizes.
+
+seq is numbered CRLF lines like the output of seq(1), so every line is
+written and scrolled on its own. blank is bare line feeds and csi is
+scroll up control sequences, which are both scrolled many lines at a
+time."""
+import io
+import time
+from pyt import actions
+from pyt import config
+from pyt.main.run_terminal.TerminalStore.Terminal import Terminal
+
+n_lines = 1_000_000
+sizes = (80, 24), (300, 100)
+inputs = {
+    'seq': b''.join(b'%d\r\n' % i for i in range(n_lines)),
+    'blank': b'\n' * n_lines,
+    'csi': b'\x1b[100S' * (n_lines // 100),
+}
+
+
+def bench(data):
+    terminal = Terminal()
+    chunk_size = io.DEFAULT_BUFFER_SIZE
+    start = time.perf_counter()
+
+    for i in range(0, len(data), chunk_size):
+        terminal = terminal.reduce(
+            actions.PutByteSequence(data[i:i + chunk_size]))
+
+    return time.perf_counter() - start
+
+
+def main():
+    for config.width, config.height in sizes:
+        for name, data in inputs.items():
+            seconds = bench(data)
+            print(f'{config.width}x{config.height} {name}: {seconds:.2f} s, '
+                  f'{n_lines / seconds:.0f} lines/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Memory held by the scrollback after a long session.
+
+A million log lines are scrolled through an 80x24 terminal with a few
+scrollback caps, then the memory still allocated is reported."""
+import io
+import random
+import time
+import tracemalloc
+from pyt import actions
+from pyt import config
+from pyt.main.run_terminal.TerminalStore.Terminal import Terminal
+
+n_lines = 1_000_000
+caps = (
+    (config.scrollback_lines, config.scrollback_bytes),
+    (10_000, 1 << 24),
+    (1_000_000, 1 << 20),
+)
+
+
+def log_lines():
+    rand = random.Random(0)
+    words = [b'GET', b'/api/v1/items', b'200', b'OK', b'took', b'12ms', b'-']
+    return b''.join(
+        b' '.join(rand.choice(words) for _ in range(rand.randrange(1, 12)))
+        + b'\r\n'
+        for _ in range(n_lines)
+    )
+
+
+def bench(data):
+    tracemalloc.start()
+    terminal = Terminal()
+    chunk_size = io.DEFAULT_BUFFER_SIZE
+    start = time.perf_counter()
+
+    for i in range(0, len(data), chunk_size):
+        terminal = terminal.reduce(
+            actions.PutByteSequence(data[i:i + chunk_size]))
+
+    seconds = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, memory, terminal.scrollback
+
+
+def main():
+    data = log_lines()
+
+    for config.scrollback_lines, config.scrollback_bytes in caps:
+        seconds, memory, scrollback = bench(data)
+        print(f'cap {config.scrollback_lines} lines, '
+              f'{config.scrollback_bytes / 2 ** 20:.0f} MiB: '
+              f'kept {len(scrollback)} lines, '
+              f'{scrollback.n_bytes / 2 ** 20:.1f} MiB of text, '
+              f'{memory / 2 ** 20:.1f} MiB allocated, {seconds:.1f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Cost of redux_example's globals_ selector when callers alternate between
+two states, and when only a slice it does not read keeps changing."""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..',
+                                'redux_example'))
+
+import actions  # noqa: E402
+import my_selectors  # noqa: E402
+import redux  # noqa: E402
+from State import State  # noqa: E402
+
+n_calls = 2000
+
+
+def stacked_state(n_entries, angle):
+    store = redux.Store(State())
+
+    for _ in range(n_entries):
+        store.dispatch(actions.SetMatrix.rotation(angle))
+        store.dispatch(redux.stack_actions.Push())
+
+    return store.state
+
+
+def alternating():
+    states = stacked_state(20, 30), stacked_state(20, 45)
+    return [states[i % 2] for i in range(n_calls)]
+
+
+def unrelated():
+    state = stacked_state(20, 30)
+    toggle = actions.ToggleGeometryOption(actions.GeometryOptions.LOCALS)
+    states = []
+
+    for _ in range(n_calls):
+        state = state.reduce(toggle)
+        states.append(state)
+
+    return states
+
+
+inputs = {
+    'alternating': alternating(),
+    'unrelated': unrelated(),
+}
+
+
+def main():
+    for name, states in inputs.items():
+        start = time.perf_counter()
+
+        for state in states:
+            my_selectors.globals_(state)
+
+        elapsed = (time.perf_counter() - start) / len(states)
+        print(f'{name}: {elapsed * 1e6:.1f} us/call, '
+              f'{my_selectors.globals_.cache_info()}')
+        my_selectors.globals_.cache_clear()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Time to hand a frame from run_terminal to the window: pickling a
+ScreenDelta and applying it, against writing and reading the SharedScreen.
+Both sides run in this process, so this is the CPU cost without the IPC
+wait."""
+import pickle
+import random
+import time
+from pyt import actions
+from pyt import config
+from pyt.Logger import Logger
+from pyt.main.SharedScreen import SharedScreen
+from pyt.main.run_terminal.TerminalStore.ScreenDelta import ScreenDelta
+from pyt.main.run_terminal.TerminalStore.Terminal import Terminal
+
+rand = random.Random(0)
+sizes = (80, 24), (300, 100)
+n_frames = 500
+
+
+def printable(n_bytes):
+    return bytes(rand.randrange(0x20, 0x7f) for _ in range(n_bytes))
+
+
+def states():
+    terminal = Terminal()
+    result = []
+
+    for _ in range(n_frames):
+        terminal = terminal.reduce(actions.PutByteSequence(
+            printable(config.width // 2) + b'\r\n'))
+        result.append(terminal)
+
+    return result
+
+
+def bench_delta(terminals):
+    screen = None
+    start = time.perf_counter()
+
+    for terminal in terminals:
+        _, dirty_rows = terminal.take_damage()
+        message = pickle.dumps(ScreenDelta.from_terminal(terminal, dirty_rows))
+        screen = pickle.loads(message).apply(screen)
+
+    return (time.perf_counter() - start) / len(terminals)
+
+
+def bench_shared(terminals):
+    shared_screen = SharedScreen(config.width, config.height)
+    start = time.perf_counter()
+
+    for terminal in terminals:
+        shared_screen.write(terminal).read()
+
+    elapsed = time.perf_counter() - start
+    shared_screen.close()
+    shared_screen.unlink()
+    return elapsed / len(terminals)
+
+
+def main():
+    Logger.disabled = True
+
+    for config.width, config.height in sizes:
+        terminals = states()
+        # Each run takes the damage, so both start from fresh copies
+        delta_time = bench_delta([t.copy() for t in terminals])
+        shared_time = bench_shared([t.copy() for t in terminals])
+        print(f'{config.width}x{config.height}: '
+              f'delta {delta_time * 1e6:.0f} us/frame, '
+              f'shared {shared_time * 1e6:.0f} us/frame')
+
+
+if __name__ == '__main__':
+    main()
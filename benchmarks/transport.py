@@ -0,0 +1,66 @@
+"""Throughput of the read_master -> run_terminal hop, comparing the
+multiprocessing.Queue transport against the shared memory ByteRing."""
+import io
+import multiprocessing
+import time
+import pyt
+from pyt import actions
+from pyt.main.ByteRing import ByteRing
+
+chunk = bytes(range(256)) * (io.DEFAULT_BUFFER_SIZE // 256)
+n_chunks = 50_000
+
+
+@pyt.make_process(daemon=True)
+def queue_producer(action_queue):
+    for _ in range(n_chunks):
+        action_queue.put(actions.PutByteSequence(chunk))
+
+    action_queue.put(actions.Quit())
+
+
+@pyt.make_process(daemon=True)
+def ring_producer(action_queue, byte_ring):
+    for _ in range(n_chunks):
+        if byte_ring.write(chunk):
+            action_queue.put(actions.ReadByteRing())
+
+    action_queue.put(actions.Quit())
+
+
+def consume(action_queue, byte_ring=None):
+    n_bytes = 0
+
+    while True:
+        action = action_queue.get()
+
+        if isinstance(action, actions.Quit):
+            return n_bytes
+        elif isinstance(action, actions.ReadByteRing):
+            for byte_sequence in byte_ring.read():
+                n_bytes += len(byte_sequence)
+        else:
+            n_bytes += len(action.byte_sequence)
+
+
+def bench(name, producer, *args):
+    action_queue = multiprocessing.Queue()
+    start = time.perf_counter()
+    proc = producer(action_queue, *args)
+    n_bytes = consume(action_queue, *args)
+    elapsed = time.perf_counter() - start
+    proc.join()
+    assert n_bytes == n_chunks * len(chunk)
+    print(f'{name}: {n_bytes / elapsed / 2 ** 20:.0f} MiB/s')
+
+
+def main():
+    bench('queue', queue_producer)
+    byte_ring = ByteRing(pyt.config.byte_ring_size)
+    bench('ring', ring_producer, byte_ring)
+    byte_ring.close()
+    byte_ring.unlink()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""Decoding throughput of UnicodeBuffer.add_bytes in PTY sized chunks."""
+import io
+import random
+import time
+from pyt.main.run_terminal.TerminalStore.Terminal.TerminalActions \
+    .TerminalBase.UnicodeBuffer import UnicodeBuffer
+
+size = 1 << 20
+rand = random.Random(0)
+inputs = {
+    'ascii': bytes(rand.randrange(0x20, 0x7f) for _ in range(size)),
+    'cjk': ''.join(
+        chr(rand.randrange(0x4e00, 0xa000)) for _ in range(size // 3)
+    ).encode(),
+    'malformed': bytes(rand.randrange(0x80, 0x100) for _ in range(size)),
+}
+
+
+def bench(data):
+    unicode_buffer = UnicodeBuffer()
+    chunk_size = io.DEFAULT_BUFFER_SIZE
+    start = time.perf_counter()
+
+    for i in range(0, len(data), chunk_size):
+        unicode_buffer.add_bytes(data[i:i + chunk_size])
+
+    return len(data) / (time.perf_counter() - start)
+
+
+def main():
+    for name, data in inputs.items():
+        print(f'{name}: {bench(data) / 2 ** 20:.2f} MiB/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -7,12 +7,14 @@ from .make_process import make_process
 __all__ = 'Logger'
 
 
+formatter = logging.Formatter('%(name)s: %(process)d: %(levelname)s: '
+                              '%(message)s')
+
+
 class QueueLogHandler(logging.Handler):
     def __init__(self, message_queue):
         super().__init__(logging.INFO)
-        fmt = logging.Formatter('%(name)s: %(process)d: %(levelname)s: '
-                                '%(message)s')
-        super().setFormatter(fmt)
+        super().setFormatter(formatter)
         self.message_queue = message_queue
 
     def emit(self, record):
@@ -38,8 +40,18 @@ class Logger(logging.Logger):
     def __init__(self):
         super().__init__('pyt')
         self.message_queue = multiprocessing.Queue()
-        handler = QueueLogHandler(self.message_queue)
+        self.handler = QueueLogHandler(self.message_queue)
+        super().addHandler(self.handler)
+
+    def start(self, process=True):
+        if process:
+            print_messages(self.message_queue)
+            return
+
+        # Everything runs in this process, so skip the queue and the printer
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setLevel(logging.INFO)
+        handler.setFormatter(formatter)
+        super().removeHandler(self.handler)
         super().addHandler(handler)
-
-    def start(self):
-        print_messages(self.message_queue)
+        self.handler = handler
@@ -3,7 +3,7 @@ import typing
 
 __all__ = (
     'PutByte', 'PutByteSequence', 'PutCodePoint', 'PutString', 'KeyboardInput',
-    'Quit',
+    'Quit', 'ReadByteRing',
 )
 
 action = dataclasses.dataclass(frozen=True)
@@ -37,3 +37,8 @@ class KeyboardInput:
 @action
 class Quit:
     pass
+
+
+@action
+class ReadByteRing:
+    pass
@@ -1,5 +1,46 @@
-__all__ = 'width', 'height', 'tab_width'
+__all__ = (
+    'width', 'height', 'tab_width', 'transport', 'byte_ring_size',
+    'scrollback_lines', 'scrollback_bytes', 'reduce_in_place', 'fps',
+    'keyframe_interval', 'screen_transport', 'action_log_size',
+    'action_log_snapshot_interval',
+)
 
 width = 80
 height = 24
 tab_width = 8
+
+# How read_master hands PTY output to run_terminal: 'queue' pickles every read
+# into the action queue, 'ring' writes it into a shared memory ByteRing, which
+# needs Python 3.8 or later
+transport = 'queue'
+byte_ring_size = 1 << 20
+
+# Lines that scroll off the top are kept until either cap is reached, then
+# the oldest ones are dropped
+scrollback_lines = 100_000
+scrollback_bytes = 1 << 24
+
+# Let run_terminal's TerminalStore change its terminal in place instead of
+# copying it for every action. Queued states are then snapshots that share
+# rows with the live terminal until it writes to them.
+reduce_in_place = False
+
+# Most states run_terminal hands to the window per second. States reduced in
+# between are skipped, and 0 hands over every one.
+fps = 60
+
+# The window is sent the rows that changed since the last state it was sent,
+# with every row in the first state and in every keyframe_interval-th one
+keyframe_interval = 60
+
+# How run_terminal hands states to the window: 'queue' pickles screen deltas
+# into the terminal queue, 'shared' writes the screen into shared memory that
+# the window reads the latest frame from, which needs Python 3.8 or later
+screen_transport = 'queue'
+
+# Actions run_terminal's TerminalStore logs so store.state_at can rebuild the
+# terminal as it was after any of them, 0 logs none. Every
+# action_log_snapshot_interval-th state is kept as a snapshot to replay from,
+# trading memory for seek time.
+action_log_size = 0
+action_log_snapshot_interval = 1000
@@ -0,0 +1,134 @@
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+
+__all__ = 'ByteRing'
+
+
+class ByteRing:
+    """Single-producer/single-consumer byte ring in shared memory.
+
+    The header holds two monotonically increasing byte counts: head is only
+    written by the consumer and tail is only written by the producer. The
+    bytes themselves are copied without a lock, which is only held to load
+    or store a count. Acquiring and releasing it orders the bytes written
+    before a new tail, and the bytes read before a new head, whatever the
+    CPU reorders otherwise.
+
+    The producer sets the pending event when new bytes arrive for a
+    consumer that has caught up, and the consumer clears it before
+    draining, so wake-ups are coalesced to one per drain instead of one per
+    write."""
+    header_size = 16
+    poll_interval = 0.001
+
+    def __init__(self, size, name=None, pending=None, lock=None):
+        self.size = size
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=name is None, size=self.header_size + size)
+        self.counters = self.shm.buf[:self.header_size].cast('Q')
+        self.data = self.shm.buf[self.header_size:self.header_size + size]
+
+        if pending is None:
+            pending = multiprocessing.Event()
+
+        if lock is None:
+            lock = multiprocessing.Lock()
+
+        self.pending = pending
+        self.lock = lock
+
+    def __reduce__(self):
+        return type(self), (self.size, self.shm.name, self.pending,
+                            self.lock)
+
+    def close(self):
+        self.counters.release()
+        self.data.release()
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+    def _load_counters(self):
+        with self.lock:
+            return tuple(self.counters)
+
+    def __len__(self):
+        head, tail = self._load_counters()
+        return tail - head
+
+    def writable(self, max_bytes=None):
+        """Return a view of the contiguous free space at the tail, waiting
+        for the consumer if the ring is full."""
+        if max_bytes is None:
+            max_bytes = self.size
+
+        while True:
+            head, tail = self._load_counters()
+            n_free = self.size - (tail - head)
+
+            if n_free:
+                break
+
+            time.sleep(self.poll_interval)
+
+        start = tail % self.size
+        n_bytes = min(n_free, self.size - start, max_bytes)
+        return self.data[start:start + n_bytes]
+
+    def commit(self, n_bytes):
+        """Publish n_bytes written into the last writable() view. Return True
+        if the consumer has to be notified."""
+        with self.lock:
+            self.counters[1] += n_bytes
+
+        if not n_bytes or self.pending.is_set():
+            return False
+
+        self.pending.set()
+        return True
+
+    def unread(self):
+        """Mark the bytes a consumer stopped reading before as pending again.
+        Return True if the consumer has to be notified."""
+        if not len(self) or self.pending.is_set():
+            return False
+
+        self.pending.set()
+        return True
+
+    def write(self, data):
+        data = memoryview(data).cast('B')
+        notify = False
+
+        while data:
+            view = self.writable(len(data))
+            n_bytes = len(view)
+            view[:] = data[:n_bytes]
+            notify |= self.commit(n_bytes)
+            data = data[n_bytes:]
+
+        return notify
+
+    def read(self, max_bytes=None):
+        """Yield views of the pending bytes without copying, at most
+        max_bytes each. Each view stays valid until the next one is
+        requested."""
+        if max_bytes is None:
+            max_bytes = self.size
+
+        self.pending.clear()
+
+        while True:
+            head, tail = self._load_counters()
+
+            if head == tail:
+                return
+
+            start = head % self.size
+            n_bytes = min(tail - head, self.size - start, max_bytes)
+            yield self.data[start:start + n_bytes]
+
+            with self.lock:
+                self.counters[0] = head + n_bytes
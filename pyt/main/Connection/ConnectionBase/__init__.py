@@ -42,6 +42,17 @@ def font_check(method):
     return wrapped
 
 
+def pixmap_check(method):
+    @functools.wraps(method)
+    def wrapped(self, *args, **kwargs):
+        if self.pixmap_id is None:
+            raise RuntimeError('Pixmap has not been created')
+
+        return method(self, *args, **kwargs)
+
+    return wrapped
+
+
 class ConnectionAPIWrapper(ConnectionHandler):
     # Wraps core API to expose more pythonic and high level API
     def __init__(self, *args, **kwargs):
@@ -49,11 +60,20 @@ class ConnectionAPIWrapper(ConnectionHandler):
         self.window_id = None
         self.gc_id = None
         self.font_id = None
+        self.pixmap_id = None
 
     @property
     def screen(self):
         return self.setup.roots[0]
 
+    @property
+    def drawable(self):
+        # Drawing goes to the pixmap when there is one
+        if self.pixmap_id is None:
+            return self.window_id
+
+        return self.pixmap_id
+
     @staticmethod
     def parse_attrs(attrs):
         def key_from_item(item):
@@ -94,13 +114,34 @@ class ConnectionAPIWrapper(ConnectionHandler):
                            *self.parse_attrs(attrs))
         return self
 
+    @gc_check
+    def change_gc(self, attrs):
+        self.core.ChangeGC(self.gc_id, *self.parse_attrs(attrs))
+        return self
+
     @gc_check
     def free_gc(self):
         self.core.FreeGC(self.gc_id)
         self.gc_id = None
         return self
 
+    @window_check
+    def create_pixmap(self, width, height):
+        self.pixmap_id = super().generate_id()
+        self.core.CreatePixmap(self.screen.root_depth, self.pixmap_id,
+                               self.window_id, width, height)
+        return self
+
+    @pixmap_check
+    def free_pixmap(self):
+        self.core.FreePixmap(self.pixmap_id)
+        self.pixmap_id = None
+        return self
+
     def __exit__(self, exc_type, exc_value, traceback):
+        if self.pixmap_id:
+            self.free_pixmap()
+
         if self.gc_id:
             self.free_gc()
 
@@ -113,7 +154,7 @@ class ConnectionAPIWrapper(ConnectionHandler):
     @window_check
     def poly_fill_rectangle(self, *rectangles):
         self.core.PolyFillRectangle(
-            self.window_id, self.gc_id, len(rectangles),
+            self.drawable, self.gc_id, len(rectangles),
             [xproto.RECTANGLE.synthetic(*rectangle)
              for rectangle in rectangles])
         return self
@@ -145,7 +186,21 @@ class ConnectionAPIWrapper(ConnectionHandler):
 
     @gc_check
     def image_text_8(self, x, y, text):
-        self.core.ImageText8(len(text), self.window_id, self.gc_id, x, y, text)
+        self.core.ImageText8(len(text), self.drawable, self.gc_id, x, y, text)
+        return self
+
+    @window_check
+    def send_event(self, event, event_mask=xproto.EventMask.NoEvent,
+                   propagate=False):
+        self.core.SendEvent(propagate, self.window_id, event_mask,
+                            event.pack())
+        return self
+
+    @gc_check
+    def copy_area(self, src_drawable, dst_drawable, src_x, src_y, dst_x,
+                  dst_y, width, height):
+        self.core.CopyArea(src_drawable, dst_drawable, self.gc_id,
+                           src_x, src_y, dst_x, dst_y, width, height)
         return self
 
     @font_check
@@ -235,6 +290,24 @@ class ConnectionAbstractionLayer(ConnectionAPIWrapper):
 
         return True
 
+    def send_client_message(self, type, data32=(0, 0, 0, 0, 0)):
+        data = xproto.ClientMessageData.synthetic(data32, '=5I')
+        return super().send_event(xproto.ClientMessageEvent.synthetic(
+            32, self.window_id, type, data))
+
+    def new_pixmap(self, width, height, pixel):
+        # A new pixmap holds garbage, so it is filled with pixel first
+        return super() \
+            .create_pixmap(width, height) \
+            .change_gc({xproto.GC.Foreground: pixel}) \
+            .poly_fill_rectangle((0, 0, width, height))
+
+    @pixmap_check
+    def show_area(self, x, y, width, height):
+        # Copies what was drawn into the pixmap onto the window
+        return super().copy_area(self.pixmap_id, self.window_id,
+                                 x, y, x, y, width, height)
+
     def clear(self, exposures=False):
         return super().clear_area(0, 0, 0xffff, 0xffff, exposures=exposures)
 
@@ -289,11 +362,29 @@ class ConnectionFont(ConnectionAbstractionLayer):
     def put_text(self, row, col, text):
         return super().image_text_8(*self.font_info.cell_to_xy(row, col), text)
 
+    def move_rows(self, src_row, dst_row, n_rows, n_cols):
+        width = self.font_info.width
+        height = self.font_info.height
+        return super().copy_area(self.drawable, self.drawable,
+                                 0, src_row * height, 0, dst_row * height,
+                                 n_cols * width, n_rows * height)
+
+    def show_rows(self, row, n_rows, n_cols):
+        width = self.font_info.width
+        height = self.font_info.height
+        return super().show_area(0, row * height,
+                                 n_cols * width, n_rows * height)
+
     def new_window(self, n_rows, n_cols, attrs=None):
         width = n_cols * self.font_info.width
         height = n_rows * self.font_info.height
         return super().new_window(width, height, attrs=attrs)
 
+    def new_window_pixmap(self, n_rows, n_cols, pixel):
+        width = n_cols * self.font_info.width
+        height = n_rows * self.font_info.height
+        return super().new_pixmap(width, height, pixel)
+
 
 class KeyboardInput(ConnectionFont):
     def __init__(self, *args, **kwargs):
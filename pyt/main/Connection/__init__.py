@@ -1,23 +1,63 @@
 import queue
-import sys
 from xcffib import xproto
 from ... import config
 from ... import actions
 from ...Logger import Logger
+from ..run_terminal.TerminalStore.Terminal.TerminalActions.TerminalBase.Grid \
+    import decode_row
 from .ConnectionBase import ConnectionBase, window_check
 from .redraw_window import redraw_window
 
 __all__ = 'Connection'
 
+# ImageText8 takes at most 255 characters, and its 16 byte header costs as
+# much as redrawing 16 unchanged cells
+max_span = 255
+max_gap = 16
+
+
+def changed_spans(row, drawn_row=None):
+    """Yield (start, end) for the runs of cells that differ from drawn_row,
+    or for the whole row if it is None."""
+    start = end = None
+
+    for x, code_point in enumerate(row):
+        if drawn_row is not None and code_point == drawn_row[x]:
+            continue
+
+        if start is None:
+            start = x
+        elif x - end >= max_gap or x - start >= max_span:
+            yield start, end
+            start = x
+
+        end = x + 1
+
+    if start is not None:
+        yield start, end
+
+
+def encode_cells(cells):
+    # Blanks become spaces and anything outside the 8 bit font becomes '?'
+    text, _ = decode_row(cells.tobytes(), 'replace')
+    return text.replace('\0', ' ').encode('latin-1', 'replace')
+
 
 class Connection(ConnectionBase):
     def __init__(self, *args, terminal_queue=None, redraw_event=None,
-                 action_queue=None, **kwargs):
+                 action_queue=None, write_queue=None, quit_event=None,
+                 shared_screen=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.terminal_queue = terminal_queue
         self.redraw_event = redraw_event
         self.action_queue = action_queue
+        self.write_queue = write_queue
+        self.quit_event = quit_event
+        self.shared_screen = shared_screen
         self.terminal = None
+        self.redraw_atom = None
+        self.drawn_rows = []
+        self.drawn_scroll_count = 0
 
     @window_check
     def redraw_window(self):
@@ -28,6 +68,7 @@ class Connection(ConnectionBase):
         return super().__enter__().redraw_window()
 
     def xinit(self):
+        self.redraw_atom = super().intern_atom('_PYT_REDRAW')
         return super().xinit().init_font(
             name='fixed',
         ).new_window(
@@ -44,58 +85,120 @@ class Connection(ConnectionBase):
             class_='pyt',
         ).create_gc({
             xproto.GC.Foreground: self.screen.white_pixel,
+            xproto.GC.Background: self.screen.black_pixel,
             xproto.GC.GraphicsExposures: False,
+        }).new_window_pixmap(
+            n_cols=config.width,
+            n_rows=config.height,
+            pixel=self.screen.black_pixel,
+        ).change_gc({
+            xproto.GC.Foreground: self.screen.white_pixel,
         }).map_window()
 
-    def empty_terminal_queue(self, limit=None):
-        """Empty the queue by getting as fast as we can. In case the queue
-        becomes flooded, set a limit on how many times to get."""
-        if limit is None:
-            limit = sys.maxsize
+    def update_terminal(self):
+        if self.shared_screen is not None:
+            screen = self.shared_screen.read()
 
-        new_terminal = self.terminal_queue.get(block=False)
+            if screen is not None:
+                self.terminal = screen
 
-        for _ in range(limit):
+            return self
+
+        # Every delta is applied in order, the window only draws the result
+        while True:
             try:
-                new_terminal = self.terminal_queue.get(block=False)
+                delta = self.terminal_queue.get(block=False)
             except queue.Empty:
-                return new_terminal
+                return self
+
+            self.terminal = delta.apply(self.terminal)
+
+    def invalidate(self):
+        """Forget what was drawn, so the next draw repaints every cell."""
+        self.drawn_rows = []
+        return self
+
+    def scroll_drawn_rows(self, n_lines, n_cols):
+        # Moves the picture up in the pixmap, the rows that come in at the
+        # bottom keep showing what they did before
+        n_rows = len(self.drawn_rows) - n_lines
+        super().move_rows(n_lines, 0, n_rows, n_cols)
+        self.drawn_rows[:n_rows] = self.drawn_rows[n_lines:]
+        return self
+
+    def draw_row(self, y, row, drawn_row=None):
+        # ImageText8 paints the cell background, so blanks are drawn as
+        # spaces over whatever was there
+        for start, end in changed_spans(row, drawn_row):
+            super().put_text(start, y, encode_cells(row[start:end]))
+
+        return self
 
     def draw_terminal(self):
-        try:
-            new_terminal = self.empty_terminal_queue(24)
-        except queue.Empty:
-            pass
-        else:
-            self.terminal = new_terminal
+        # Compared against the rows as last drawn rather than the damage
+        # flags, since each state drained from the queue only carries the
+        # damage done since the one before it. Everything is drawn into the
+        # pixmap, then the rows that changed are shown in one go.
+        self.update_terminal()
 
         if self.terminal is None:
             return self
 
-        self.clear()
-        width = config.width
-        height = config.height
+        grid = self.terminal.grid
+        n_scrolled = grid.scroll_count - self.drawn_scroll_count
+        self.drawn_scroll_count = grid.scroll_count
 
-        for cursor, code_point in self.terminal.screen.items():
-            if not (0 <= cursor.x < width and 0 <= cursor.y < height):
-                continue
+        top = grid.height
+        bottom = 0
 
-            super().put_text(cursor.x, cursor.y, chr(code_point))
+        if len(self.drawn_rows) != grid.height:
+            self.drawn_rows = [None] * grid.height
+        elif 0 < n_scrolled < grid.height:
+            self.scroll_drawn_rows(n_scrolled, grid.width)
+            top = 0
+            bottom = grid.height - n_scrolled
 
+        for y, row in enumerate(grid):
+            if row != self.drawn_rows[y]:
+                self.draw_row(y, row, self.drawn_rows[y])
+                self.drawn_rows[y] = row[:]
+                top = min(top, y)
+                bottom = max(bottom, y + 1)
+
+        if top < bottom:
+            super().show_rows(top, bottom - top, grid.width)
+
+        return self
+
+    def write_input(self, keyboard_input):
+        # Straight to write_master so keystrokes never wait behind PTY output
+        # in the action queue
+        self.write_queue.put(keyboard_input.encode())
+        return self
+
+    def quit(self):
+        # The event lets run_terminal skip whatever output is still queued
+        # ahead of the Quit action, which only serves to wake it up
+        self.quit_event.set()
+        self.action_queue.put(actions.Quit())
         return self
 
     def handle_event(self, event):
         if not super().handle_event(event):
-            self.action_queue.put(actions.Quit())
+            self.quit()
             return False
 
         if isinstance(event, xproto.ExposeEvent):
-            self.draw_terminal()
+            super().show_area(event.x, event.y, event.width, event.height)
+
+        if isinstance(event, xproto.ClientMessageEvent):
+            if event.type == self.redraw_atom:
+                self.draw_terminal()
 
         if isinstance(event, xproto.KeyPressEvent):
             keyboard_input = super().keycode_to_str(event.detail)
 
             if keyboard_input is not None:
-                self.action_queue.put(actions.KeyboardInput(keyboard_input))
+                self.write_input(keyboard_input)
 
         return True
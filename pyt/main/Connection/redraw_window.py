@@ -6,16 +6,23 @@ __all__ = 'redraw_window'
 
 
 class RedrawWindowConnection(ConnectionBase):
+    # Wakes up the main connection with a client message rather than an
+    # exposure, so the window is not cleared and only the damage is redrawn
     def __init__(self, *args, redraw_event=None, window_id=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.redraw_event = redraw_event
         self.window_id = window_id
+        self.redraw_atom = None
+
+    def xinit(self):
+        self.redraw_atom = super().intern_atom('_PYT_REDRAW')
+        return super().xinit()
 
     def loop(self):
         while True:
             self.redraw_event.wait()
-            super().redraw().flush()
             self.redraw_event.clear()
+            super().send_client_message(self.redraw_atom).flush()
 
 
 @make_process(daemon=True)
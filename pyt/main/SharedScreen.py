@@ -0,0 +1,114 @@
+import array
+import multiprocessing
+from multiprocessing import shared_memory
+from .run_terminal.TerminalStore.ScreenDelta import Screen
+from .run_terminal.TerminalStore.Terminal.TerminalActions.TerminalBase \
+    import Cursor
+from .run_terminal.TerminalStore.Terminal.TerminalActions.TerminalBase.Grid \
+    import Grid
+
+__all__ = 'SharedScreen'
+
+
+class SharedScreen:
+    """Single-writer, single-reader screen in shared memory, triple
+    buffered.
+
+    The writer fills its back buffer with a whole frame, then swaps it with
+    the latest one and marks that fresh. The reader swaps a fresh latest
+    buffer with its front one and copies the frame out of that. The writer
+    never touches the front buffer, so a frame can not be torn. The lock is
+    only held for the swaps. Acquiring and releasing it orders the frame's
+    stores before the swap, whatever the CPU reorders otherwise.
+
+    Each buffer holds the scroll count and the cursor, followed by the
+    cells in screen order. The header holds which buffer is back, latest
+    and front, and whether latest is fresh."""
+    header_size = 32
+    frame_header_size = 24
+
+    def __init__(self, width, height, name=None, lock=None):
+        self.width = width
+        self.height = height
+        self.frame_size = self.frame_header_size + 4 * width * height
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=name is None,
+            size=self.header_size + 3 * self.frame_size)
+
+        if lock is None:
+            lock = multiprocessing.Lock()
+
+        self.lock = lock
+        self.header = self.shm.buf[:self.header_size].cast('Q')
+
+        if name is None:
+            self.header[1] = 1
+            self.header[2] = 2
+
+        self.frame_headers = []
+        self.cell_bytes = []
+        self.cells = []
+
+        for i in range(3):
+            start = self.header_size + i * self.frame_size
+            cells_start = start + self.frame_header_size
+            self.frame_headers.append(
+                self.shm.buf[start:cells_start].cast('Q'))
+            self.cell_bytes.append(
+                self.shm.buf[cells_start:start + self.frame_size])
+            self.cells.append(self.cell_bytes[i].cast('I'))
+
+    def __reduce__(self):
+        return type(self), (self.width, self.height, self.shm.name,
+                            self.lock)
+
+    def close(self):
+        for view in self.frame_headers + self.cells + self.cell_bytes:
+            view.release()
+
+        self.header.release()
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+    def write(self, terminal):
+        """Publish the screen of terminal as the latest frame."""
+        width = self.width
+        back = self.header[0]
+        cells = self.cells[back]
+
+        for y, row in enumerate(terminal.grid):
+            cells[y * width:(y + 1) * width] = row
+
+        frame_header = self.frame_headers[back]
+        frame_header[0] = terminal.grid.scroll_count
+        frame_header[1] = terminal.cursor.x
+        frame_header[2] = terminal.cursor.y
+
+        with self.lock:
+            self.header[0] = self.header[1]
+            self.header[1] = back
+            self.header[3] = 1
+
+        return self
+
+    def read(self):
+        """Return a Screen with a copy of the latest frame, or None if there
+        has been no write since the last read."""
+        with self.lock:
+            if not self.header[3]:
+                return None
+
+            front = self.header[1]
+            self.header[1] = self.header[2]
+            self.header[2] = front
+            self.header[3] = 0
+
+        cells = array.array('I')
+        cells.frombytes(self.cell_bytes[front])
+        scroll_count, cursor_x, cursor_y = self.frame_headers[front]
+        width = self.width
+        rows = [cells[y * width:(y + 1) * width] for y in range(self.height)]
+        grid = Grid(self.width, self.height, rows, scroll_count=scroll_count)
+        return Screen(grid, Cursor(cursor_x, cursor_y))
@@ -1,10 +1,13 @@
+import argparse
 import io
 import multiprocessing
 import os
 from .. import actions
+from .. import config
 from ..Logger import Logger
 from ..make_process import make_process
 from .Connection import Connection
+from .run_asyncio import run_asyncio
 from .run_terminal import run_terminal
 
 __all__ = 'main'
@@ -20,10 +23,17 @@ def write_master(master, write_queue):
 
 
 @make_process(daemon=True)
-def read_master(master, action_queue):
+def read_master(master, action_queue, byte_ring=None):
     Logger.debug('read_master')
     buf_size = io.DEFAULT_BUFFER_SIZE
 
+    if byte_ring is not None:
+        while True:
+            n_bytes = os.readv(master, [byte_ring.writable(buf_size)])
+
+            if byte_ring.commit(n_bytes):
+                action_queue.put(actions.ReadByteRing())
+
     while True:
         buf = os.read(master, buf_size)
         action_queue.put(actions.PutByteSequence(buf))
@@ -44,20 +54,65 @@ def new_pty():
         return master
 
 
-def main():
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(prog='pyt')
+    parser.add_argument(
+        '--engine', choices=['process', 'asyncio'], default='process',
+        help='process runs the reader, writer, terminal and redraw loops in '
+             'separate processes, asyncio runs them all in one event loop')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
     master = new_pty()
+
+    if args.engine == 'asyncio':
+        Logger.start(process=False)
+        run_asyncio(master)
+        return
+
     Logger.start()
     Logger.debug('GUI')
     action_queue = multiprocessing.Queue()
-    read_master(master, action_queue)
+
+    if config.transport == 'ring':
+        # multiprocessing.shared_memory is only there from Python 3.8 on,
+        # so it is only imported by those who opt in
+        from .ByteRing import ByteRing
+        byte_ring = ByteRing(config.byte_ring_size)
+    else:
+        byte_ring = None
+
+    read_master(master, action_queue, byte_ring)
     terminal_queue = multiprocessing.Queue()
     write_queue = multiprocessing.Queue()
     write_master(master, write_queue)
     redraw_event = multiprocessing.Event()
+    quit_event = multiprocessing.Event()
+
+    if config.screen_transport == 'shared':
+        # Needs multiprocessing.shared_memory too
+        from .SharedScreen import SharedScreen
+        shared_screen = SharedScreen(config.width, config.height)
+    else:
+        shared_screen = None
+
     connection = Connection(terminal_queue=terminal_queue,
                             redraw_event=redraw_event,
-                            action_queue=action_queue)
+                            action_queue=action_queue,
+                            write_queue=write_queue,
+                            quit_event=quit_event,
+                            shared_screen=shared_screen)
     proc = run_terminal(terminal_queue, redraw_event, action_queue,
-                        write_queue)
+                        write_queue, quit_event, byte_ring, shared_screen)
     connection.run()
     proc.join()
+
+    if byte_ring is not None:
+        byte_ring.close()
+        byte_ring.unlink()
+
+    if shared_screen is not None:
+        shared_screen.close()
+        shared_screen.unlink()
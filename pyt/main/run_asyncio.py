@@ -0,0 +1,88 @@
+import asyncio
+import io
+import os
+from .. import actions
+from ..Logger import Logger
+from .Connection import Connection
+from .run_terminal.TerminalStore import TerminalStore
+
+__all__ = 'run_asyncio'
+
+
+class AsyncioConnection(Connection):
+    # Shares one event loop with the PTY and the TerminalStore, so terminal
+    # states are drawn straight from the store instead of going through queues
+    def __init__(self, *args, master=None, store=None, event_loop=None,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        self.master = master
+        self.store = store
+        self.event_loop = event_loop
+        self.draw_scheduled = False
+
+    def redraw_window(self):
+        # Draws are scheduled on the event loop, no helper process needed
+        return self
+
+    def update_terminal(self):
+        self.terminal = self.store.state
+        return self
+
+    def write_input(self, keyboard_input):
+        os.write(self.master, keyboard_input.encode())
+        return self
+
+    def quit(self):
+        self.event_loop.stop()
+        return self
+
+    def schedule_draw(self):
+        if not self.draw_scheduled:
+            self.draw_scheduled = True
+            self.event_loop.call_soon(self.draw_now)
+
+    def draw_now(self):
+        self.draw_scheduled = False
+        self.draw_terminal().flush()
+        # xcb may have queued events while flushing, which would not make the
+        # file descriptor readable again
+        self.handle_pending_events()
+
+    def read_master(self):
+        try:
+            buf = os.read(self.master, io.DEFAULT_BUFFER_SIZE)
+        except OSError:  # shell exited
+            self.quit()
+            return
+
+        self.store.dispatch(actions.PutByteSequence(buf))
+
+    def handle_pending_events(self):
+        while True:
+            event = super().poll_for_event()
+
+            if event is None:
+                break
+
+            if not self.handle_event(event):
+                break
+
+        self.flush()
+
+    def loop(self):
+        self.event_loop.add_reader(self.master, self.read_master)
+        self.event_loop.add_reader(super().get_file_descriptor(),
+                                   self.handle_pending_events)
+        self.handle_pending_events()
+        self.event_loop.run_forever()
+
+
+def run_asyncio(master):
+    Logger.debug('run_asyncio')
+    event_loop = asyncio.new_event_loop()
+    store = TerminalStore()
+    connection = AsyncioConnection(master=master, store=store,
+                                   event_loop=event_loop)
+    store.subscribe(connection.schedule_draw)
+    connection.run()
+    event_loop.close()
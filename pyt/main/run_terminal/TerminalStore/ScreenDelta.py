@@ -0,0 +1,67 @@
+import array
+import dataclasses
+import typing
+from .Terminal.TerminalActions.TerminalBase import Cursor
+from .Terminal.TerminalActions.TerminalBase.Grid import Grid
+
+__all__ = 'Screen', 'ScreenDelta'
+
+
+@dataclasses.dataclass
+class Screen:
+    """What the window keeps of the terminal, rebuilt from ScreenDelta."""
+    grid: Grid
+    cursor: Cursor = Cursor()
+
+
+@dataclasses.dataclass
+class ScreenDelta:
+    """The rows of a terminal's grid changed since the previous delta, as the
+    bytes of their array('I'), plus its scroll count and cursor. A keyframe
+    carries every row and replaces the grid it is applied to."""
+    width: int
+    height: int
+    scroll_count: int
+    cursor: Cursor
+    rows: typing.List[typing.Tuple[int, bytes]]
+    keyframe: bool = False
+
+    @classmethod
+    def from_terminal(cls, terminal, dirty_rows, keyframe=False):
+        grid = terminal.grid
+
+        if keyframe:
+            dirty_rows = range(grid.height)
+
+        return cls(
+            grid.width,
+            grid.height,
+            grid.scroll_count,
+            terminal.cursor,
+            [(y, grid[y].tobytes()) for y in dirty_rows],
+            keyframe,
+        )
+
+    def apply(self, screen=None):
+        """Bring screen up to date and return it. Without a screen, or one of
+        another size, only a keyframe makes sense."""
+        if (self.keyframe or screen is None
+                or (screen.grid.width, screen.grid.height)
+                != (self.width, self.height)):
+            screen = Screen(Grid(self.width, self.height,
+                                 scroll_count=self.scroll_count))
+
+        grid = screen.grid
+
+        # The rows that scroll in are blank until a changed row lands there,
+        # the rest moved along with the picture
+        grid.scroll_up(max(self.scroll_count - grid.scroll_count, 0))
+        grid.scroll_count = self.scroll_count
+
+        for y, row_bytes in self.rows:
+            row = array.array('I')
+            row.frombytes(row_bytes)
+            grid.writable_row(y)[:] = row
+
+        screen.cursor = self.cursor
+        return screen
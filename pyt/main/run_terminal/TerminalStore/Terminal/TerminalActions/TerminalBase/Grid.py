@@ -0,0 +1,175 @@
+import array
+import codecs
+import sys
+from ....... import config
+
+__all__ = 'Grid'
+
+# Decodes the native byte order of array('I')
+if sys.byteorder == 'little':
+    decode_row = codecs.utf_32_le_decode
+else:
+    decode_row = codecs.utf_32_be_decode
+
+
+class Grid:
+    """Screen cells as one array('I') of code points per row, 0 for blank.
+
+    The rows form a circular buffer: screen row y is rows[(head + y) %
+    height], so scrolling advances head and blanks the rows that come in at
+    the bottom instead of moving any.
+
+    A snapshot shares its rows with the grid it was taken from. Each row
+    is stamped with the epoch in which this grid last made it its own, and
+    taking a snapshot starts a new epoch on both sides, so writable_row
+    copies any row that may be shared before handing it out and neither side
+    sees the other's writes.
+
+    Damage is tracked with one dirty flag per row, set whenever a row is
+    handed out for writing or blanked, and with scroll_count, the total
+    number of lines ever scrolled. The flags follow the rows around the
+    circular buffer, so after scrolling the picture by the change in
+    scroll_count only the dirty rows have to be redrawn. A new grid starts
+    out all dirty."""
+    __slots__ = (
+        'width', 'height', 'rows', 'head', 'epoch', 'row_epochs', 'dirty',
+        'scroll_count',
+    )
+
+    def __init__(self, width, height, rows=None, head=0, epoch=0,
+                 row_epochs=None, dirty=None, scroll_count=0):
+        self.width = width
+        self.height = height
+
+        if rows is None:
+            rows = [self.blank_row() for _ in range(height)]
+
+        if row_epochs is None:
+            row_epochs = [epoch] * height
+
+        if dirty is None:
+            dirty = bytearray(b'\x01') * height
+
+        self.rows = rows
+        self.head = head
+        self.epoch = epoch
+        self.row_epochs = row_epochs
+        self.dirty = dirty
+        self.scroll_count = scroll_count
+
+    @classmethod
+    def from_config(cls, *, width=None, height=None):
+        if width is None:
+            width = config.width
+
+        if height is None:
+            height = config.height
+
+        return cls(width, height)
+
+    def blank_row(self):
+        return array.array('I', [0]) * self.width
+
+    def copy(self):
+        return type(self)(
+            self.width,
+            self.height,
+            [row[:] for row in self.rows],
+            self.head,
+            dirty=self.dirty[:],
+            scroll_count=self.scroll_count,
+        )
+
+    def snapshot(self):
+        self.epoch += 1
+        return type(self)(
+            self.width,
+            self.height,
+            self.rows[:],
+            self.head,
+            1,
+            [0] * self.height,
+            self.dirty[:],
+            self.scroll_count,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, Grid):
+            return NotImplemented
+
+        return list(self) == list(other)
+
+    def __repr__(self):
+        qualname = self.__class__.__qualname__
+        return f'{qualname}({self.width !r}, {self.height !r})'
+
+    def __getitem__(self, y):
+        return self.rows[(self.head + y) % self.height]
+
+    def writable_row(self, y):
+        index = (self.head + y) % self.height
+
+        if self.row_epochs[index] != self.epoch:
+            self.rows[index] = self.rows[index][:]
+            self.row_epochs[index] = self.epoch
+
+        self.dirty[index] = 1
+        return self.rows[index]
+
+    def mark_dirty(self, y):
+        self.dirty[(self.head + y) % self.height] = 1
+        return self
+
+    def dirty_rows(self):
+        """Return the screen rows changed since the last clear_dirty."""
+        return [
+            y for y in range(self.height)
+            if self.dirty[(self.head + y) % self.height]
+        ]
+
+    def clear_dirty(self):
+        self.dirty[:] = bytes(self.height)
+        return self
+
+    def __iter__(self):
+        """Iterate over the rows from the top of the screen."""
+        yield from self.rows[self.head:]
+        yield from self.rows[:self.head]
+
+    def items(self):
+        """Yield ((x, y), code_point) for every non-blank cell."""
+        for y, row in enumerate(self):
+            for x, code_point in enumerate(row):
+                if code_point:
+                    yield (x, y), code_point
+
+    def erase(self, y, start=0, end=None):
+        if end is None:
+            end = self.width
+
+        start = max(start, 0)
+        end = min(end, self.width)
+
+        if start < end:
+            self.writable_row(y)[start:end] = \
+                array.array('I', [0]) * (end - start)
+
+        return self
+
+    def erase_rows(self, start=0, end=None):
+        if end is None:
+            end = self.height
+
+        for y in range(max(start, 0), min(end, self.height)):
+            index = (self.head + y) % self.height
+            self.rows[index] = self.blank_row()
+            self.row_epochs[index] = self.epoch
+            self.dirty[index] = 1
+
+        return self
+
+    def scroll_up(self, n_lines=1):
+        self.scroll_count += max(n_lines, 0)
+        n_lines = min(n_lines, self.height)
+        self.head = (self.head + n_lines) % self.height
+        return self.erase_rows(self.height - n_lines)
@@ -0,0 +1,71 @@
+import collections
+from ....... import config
+from .Grid import decode_row
+
+__all__ = 'Scrollback'
+
+
+class Scrollback:
+    """Lines scrolled off the top of the screen, oldest first.
+
+    Each line is stored as UTF-8 with trailing blanks trimmed. Once either
+    cap is exceeded the oldest lines are dropped. The history only grows, so
+    every copy of a terminal state shares one Scrollback, and pickling it
+    gives an empty one so states sent to other processes stay small."""
+    __slots__ = 'max_lines', 'max_bytes', 'lines', 'n_bytes'
+
+    def __init__(self, max_lines, max_bytes):
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.lines = collections.deque()
+        self.n_bytes = 0
+
+    @classmethod
+    def from_config(cls, *, max_lines=None, max_bytes=None):
+        if max_lines is None:
+            max_lines = config.scrollback_lines
+
+        if max_bytes is None:
+            max_bytes = config.scrollback_bytes
+
+        return cls(max_lines, max_bytes)
+
+    def __reduce__(self):
+        return type(self), (self.max_lines, self.max_bytes)
+
+    def __repr__(self):
+        qualname = self.__class__.__qualname__
+        return f'{qualname}({len(self)} lines, {self.n_bytes} bytes)'
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __getitem__(self, index):
+        return self.lines[index].decode()
+
+    def __iter__(self):
+        return map(bytes.decode, self.lines)
+
+    def append(self, line):
+        self.lines.append(line)
+        self.n_bytes += len(line)
+
+        while len(self.lines) > self.max_lines \
+                or self.n_bytes > self.max_bytes:
+            self.n_bytes -= len(self.lines.popleft())
+
+        return self
+
+    def append_row(self, row):
+        # Blank cells are 0, trailing ones are dropped and the rest become
+        # spaces
+        line, _ = decode_row(row.tobytes(), 'replace')
+        line = line.rstrip('\0').replace('\0', ' ')
+        return self.append(line.encode())
+
+    def append_blank(self, n_lines):
+        # Only the lines that can survive eviction are worth adding
+        for _ in range(min(n_lines, self.max_lines)):
+            self.append(b'')
+
+        return self
@@ -26,7 +26,7 @@ class MutableSet(collections.abc.MutableSet):
         self.__set.discard(item)
 
     def copy(self):
-        return type(self)(self)
+        return type(self)(self.__set)
 
     def __repr__(self):
         qualname = self.__class__.__qualname__
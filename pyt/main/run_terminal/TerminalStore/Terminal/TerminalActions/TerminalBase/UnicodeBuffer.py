@@ -1,5 +1,5 @@
+import codecs
 import dataclasses
-import typing
 
 __all__ = 'UnicodeBuffer'
 
@@ -27,14 +27,14 @@ def verify_n_bytes(unicode_bytes):
 
 
 def verify_unicode_bytes(first=None, second=None, third=None, fourth=None):
-    if fourth:
+    if fourth is not None:
         return fourth in range(0x80, 0xc0) and third in range(0x80, 0xc0) and (
             (second in range(0x90, 0xc0) and first == 0xf0)
             or (second in range(0x80, 0xc0) and first in range(0xf1, 0xf4))
             or (second in range(0x80, 0x90) and first == 0xf4)
         )
 
-    if third:
+    if third is not None:
         return third in range(0x80, 0xc0) and (
             (second in range(0x80, 0xc0) and (first in range(0xe1, 0xed) or
                                               first in range(0xee, 0xf0)))
@@ -42,10 +42,10 @@ def verify_unicode_bytes(first=None, second=None, third=None, fourth=None):
             or (second in range(0x80, 0xa0) and first == 0xed)
         )
 
-    if second:
+    if second is not None:
         return first in range(0xc2, 0xe0) and second in range(0x80, 0xc0)
 
-    if first:
+    if first is not None:
         return True
 
 
@@ -55,7 +55,7 @@ def verify(unicode_bytes):
 
 
 def decode_verified(first=None, second=None, third=None, fourth=None):
-    if fourth:
+    if fourth is not None:
         xx = fourth & 0b00111111
         yy = (third & 0b00111111) << 6
         zz = (second & 0b00001111) << 12
@@ -64,18 +64,18 @@ def decode_verified(first=None, second=None, third=None, fourth=None):
         ) << 16
         return uu | zz | yy | xx
 
-    if third:
+    if third is not None:
         xx = third & 0b00111111
         yy = (second & 0b00111111) << 6
         zz = (first & 0b00001111) << 12
         return zz | yy | xx
 
-    if second:
+    if second is not None:
         xx = second & 0b00111111
         yy = (first & 0b00011111) << 6
         return yy | xx
 
-    if first:
+    if first is not None:
         return first
 
 
@@ -117,35 +117,53 @@ def encode(code_point):
     raise UnicodeError('code_point out of range')
 
 
-@dataclasses.dataclass
-class UnicodeBuffer:
-    unicode_buffer: typing.List[int] = dataclasses.field(default_factory=list)
+# Sequence length by first byte, 0 for bytes that cannot start a sequence
+n_bytes_table = bytes(map(get_n_bytes, range(0x100)))
+
+
+class IncompleteSequence(Exception):
+    pass
 
-    def copy(self):
-        return type(self)(
-            self.unicode_buffer[:],
-        )
 
-    def add_bytes(self, *new_bytes):
-        self.unicode_buffer.extend(new_bytes)
-        code_points = []
+def replace_sequence(error):
+    # Replace a malformed sequence with a single U+FFFD covering as many bytes
+    # as its first byte announced, unless those bytes have not arrived yet
+    n_bytes = n_bytes_table[error.object[error.start]] or 1
+    end = error.start + n_bytes
 
-        while self.unicode_buffer:
-            n_bytes = get_n_bytes(self.unicode_buffer[0])
-            code_point = 0xfffd
+    if end > len(error.object):
+        raise IncompleteSequence(error.start)
 
-            if n_bytes == 0:
-                code_points.append(code_point)
-                break
-            elif n_bytes > len(self.unicode_buffer):
-                break
+    return '\ufffd', end
 
-            unicode_bytes = self.unicode_buffer[:n_bytes]
-            self.unicode_buffer = self.unicode_buffer[n_bytes:]
 
-            if verify_unicode_bytes(*unicode_bytes):
-                code_point = decode_verified(*unicode_bytes)
+codecs.register_error('pyt-replace-sequence', replace_sequence)
 
-            code_points.append(code_point)
 
-        return code_points
+@dataclasses.dataclass
+class UnicodeBuffer:
+    unicode_buffer: bytes = b''
+
+    def copy(self):
+        return type(self)(
+            self.unicode_buffer,
+        )
+
+    def add_bytes(self, new_bytes):
+        """Decode the carried over bytes followed by new_bytes, carrying over
+        a trailing incomplete sequence to the next call."""
+        if self.unicode_buffer:
+            data = self.unicode_buffer + new_bytes
+        else:
+            data = new_bytes
+
+        try:
+            string, n_decoded = codecs.utf_8_decode(
+                data, 'pyt-replace-sequence', False)
+        except IncompleteSequence as error:
+            start, = error.args
+            string, n_decoded = codecs.utf_8_decode(
+                data[:start], 'pyt-replace-sequence', False)
+
+        self.unicode_buffer = bytes(data[n_decoded:])
+        return string
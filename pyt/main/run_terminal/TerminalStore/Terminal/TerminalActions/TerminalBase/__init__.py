@@ -3,6 +3,8 @@ import typing
 from ....... import config
 from .... import control_codes
 from ...NextCharMode import NextCharMode
+from .Grid import Grid
+from .Scrollback import Scrollback
 from .UnicodeBuffer import UnicodeBuffer
 from .Tabs import Tabs
 
@@ -23,22 +25,48 @@ class Cursor(FrozenBase):
 
 @dataclasses.dataclass
 class TerminalBase:
-    screen: typing.Dict[Cursor, int] = dataclasses.field(
-        default_factory=dict,
-        # repr=False,
-    )
-    unicode_buffer: UnicodeBuffer = UnicodeBuffer()
+    grid: Grid = dataclasses.field(default_factory=Grid.from_config)
+    unicode_buffer: UnicodeBuffer = dataclasses.field(
+        default_factory=UnicodeBuffer)
     next_char_mode: NextCharMode = NextCharMode.CHAR
     string_type: control_codes.C1_7B = None
     string_buffer: typing.List[int] = None
     csi_buffer: typing.List[int] = None
     cursor: Cursor = Cursor()
     set_char_set_selection: int = None
-    tabs: Tabs = Tabs.from_config()
+    tabs: Tabs = dataclasses.field(default_factory=Tabs.from_config)
+    scrollback: Scrollback = dataclasses.field(
+        default_factory=Scrollback.from_config,
+        repr=False,
+        compare=False,
+    )
+
+    @property
+    def screen(self):
+        # Non-blank cells keyed by position, for code that predates the grid
+        return {
+            Cursor(x, y): code_point
+            for (x, y), code_point in self.grid.items()
+        }
 
     def copy(self):
+        return self.copy_with_grid(self.grid.copy())
+
+    def snapshot(self):
+        """Return a copy that shares the grid rows until either side writes
+        to them."""
+        return self.copy_with_grid(self.grid.snapshot())
+
+    def take_damage(self):
+        """Return the grid's scroll count and the screen rows changed since
+        the last call, and start tracking afresh."""
+        damage = self.grid.scroll_count, self.grid.dirty_rows()
+        self.grid.clear_dirty()
+        return damage
+
+    def copy_with_grid(self, grid):
         return type(self)(
-            self.screen.copy(),
+            grid,
             self.unicode_buffer.copy(),
             self.next_char_mode,
             self.string_type,
@@ -47,4 +75,5 @@ class TerminalBase:
             self.cursor,
             self.set_char_set_selection,
             self.tabs.copy(),
+            self.scrollback,
         )
@@ -1,4 +1,4 @@
-import math
+import array
 from ...... import config
 from .TerminalBase import TerminalBase
 
@@ -7,7 +7,10 @@ __all__ = 'TerminalActions'
 
 class TerminalActions(TerminalBase):
     def reset(self):
-        return type(self)()
+        # Bytes of a character still coming in belong to the stream, not to
+        # the state RIS resets
+        return type(self)(unicode_buffer=self.unicode_buffer,
+                          scrollback=self.scrollback)
 
     def reset_string_buffer(self, string_type=None):
         self.string_buffer = []
@@ -30,8 +33,12 @@ class TerminalActions(TerminalBase):
 
         if tmp_y < 0:
             tmp_y = 0
-        elif tmp_y > config.height:
-            tmp_y = config.height
+        elif tmp_y > config.height - 1:
+            tmp_y = config.height - 1
+
+        if tmp_x != self.cursor.x or tmp_y != self.cursor.y:
+            # Both the cell the cursor leaves and the one it lands on change
+            self.grid.mark_dirty(self.cursor.y).mark_dirty(tmp_y)
 
         self.cursor = tmp_cursor.replace(x=tmp_x, y=tmp_y)
         return self
@@ -91,18 +98,33 @@ class TerminalActions(TerminalBase):
     def carriage_return(self):
         return self.cursor_character_absolute()
 
-    def line_feed_scroll_up(self):
-        self.screen = {
-            cursor.replace(y=cursor.y - 1): value
-            for cursor, value in self.screen.items()
-        }
+    def scroll_up(self, n_lines=None):
+        if n_lines is None:
+            n_lines = 1
+
+        n_rows = min(n_lines, config.height)
+
+        for y in range(n_rows):
+            self.scrollback.append_row(self.grid[y])
+
+        self.scrollback.append_blank(n_lines - n_rows)
+        self.grid.scroll_up(n_lines)
         return self
 
-    def line_feed(self):
-        if self.cursor.y == config.height - 1:
-            return self.line_feed_scroll_up()
+    def line_feed(self, n_lines=None):
+        # Same as n_lines single line feeds, with everything past the bottom
+        # scrolled in one go
+        if n_lines is None:
+            n_lines = 1
 
-        return self.cursor_next_line()
+        n_scrolled = n_lines - (config.height - 1 - self.cursor.y)
+
+        if n_scrolled > 0:
+            return self \
+                .scroll_up(n_scrolled) \
+                .cursor_next_line(n_lines - n_scrolled)
+
+        return self.cursor_next_line(n_lines)
 
     def horizontal_tabulation_set(self):
         self.tabs.add(self.cursor.x)
@@ -139,7 +161,7 @@ class TerminalActions(TerminalBase):
         return self.cursor_forward_tabulation()
 
     def add_char_impl(self, code_point):
-        self.screen[self.cursor] = code_point
+        self.grid.writable_row(self.cursor.y)[self.cursor.x] = code_point
         return self.cursor_forward()
 
     def add_char(self, code_point):
@@ -151,47 +173,42 @@ class TerminalActions(TerminalBase):
 
         return self.add_char_impl(code_point)
 
-    def erase_character(self, n_chars_plus_one=None):
-        if n_chars_plus_one is None:
-            n_chars_plus_one = 1
+    def add_string(self, string):
+        # Same as add_char for every character, with the word-wrap worked out
+        # a row at a time
+        start = 0
 
-        n_chars = n_chars_plus_one - 1
-        deleted_keys = []
+        while start < len(string):
+            if self.cursor.x == config.width:
+                self.line_feed()
 
-        for cursor in self.screen.keys():
-            if cursor.y == self.cursor.y \
-                    and 0 <= cursor.x - self.cursor.x <= n_chars:
-                deleted_keys.append(cursor)
+            x = self.cursor.x
+            end = min(start + config.width - x, len(string))
+            self.grid.writable_row(self.cursor.y)[x:x + end - start] = \
+                array.array('I', map(ord, string[start:end]))
+            self.update_cursor(x=x + end - start)
+            start = end
 
-        for key in deleted_keys:
-            self.screen.pop(key)
+        return self
 
+    def erase_character(self, n_chars_plus_one=None):
+        if n_chars_plus_one is None:
+            n_chars_plus_one = 1
+
+        self.grid.erase(self.cursor.y, self.cursor.x,
+                        self.cursor.x + n_chars_plus_one)
         return self
 
     def erase_in_line(self, selection=None):
         if selection is None:
             selection = 0
 
-        deleted_keys = []
-
         if selection == 0:
-            start = self.cursor.x
-            end = math.inf
+            self.grid.erase(self.cursor.y, self.cursor.x)
         elif selection == 1:
-            start = 0
-            end = self.cursor.x
+            self.grid.erase(self.cursor.y, 0, self.cursor.x + 1)
         elif selection == 2:
-            start = 0
-            end = math.inf
-        else:
-            return self
-
-        for cursor in self.screen.keys():
-            if cursor.y == self.cursor.y and start <= cursor.x <= end:
-                deleted_keys.append(cursor)
-
-        for key in deleted_keys:
-            self.screen.pop(key)
+            self.grid.erase(self.cursor.y)
 
         return self
 
@@ -199,33 +216,16 @@ class TerminalActions(TerminalBase):
         if selection is None:
             selection = 0
 
-        deleted_keys = []
-
         if selection == 0:
-            x_min = self.cursor.x
-            x_max = math.inf
-            y_min = self.cursor.y
-            y_max = math.inf
+            self.grid \
+                .erase(self.cursor.y, self.cursor.x) \
+                .erase_rows(self.cursor.y + 1)
         elif selection == 1:
-            x_min = 0
-            x_max = self.cursor.x
-            y_min = 0
-            y_max = self.cursor.y
+            self.grid \
+                .erase(self.cursor.y, 0, self.cursor.x + 1) \
+                .erase_rows(0, self.cursor.y)
         elif selection == 2:
-            x_min = 0
-            x_max = math.inf
-            y_min = 0
-            y_max = math.inf
-        else:
-            return self
-
-        for cursor in self.screen.keys():
-            if (cursor.y == self.cursor.y and x_min <= cursor.x <= x_max) \
-                    or y_min < cursor.y < y_max:
-                deleted_keys.append(cursor)
-
-        for key in deleted_keys:
-            self.screen.pop(key)
+            self.grid.erase_rows()
 
         return self
 
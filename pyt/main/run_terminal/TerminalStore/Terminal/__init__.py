@@ -1,3 +1,4 @@
+import re
 from ..... import actions
 from ..... import config
 from .....Logger import Logger
@@ -8,6 +9,28 @@ from .NextCharMode import NextCharMode
 
 __all__ = 'Terminal'
 
+# In NextCharMode.CHAR everything except C0 controls goes to add_char
+printable_run = re.compile('[^\x00-\x1f]+')
+# Every line feed also does a carriage return, so a run of CR, LF, VT and FF
+# is just as many line feeds as it has of anything but CR
+line_break_run = re.compile('[\r\n\x0b\x0c]+')
+
+C0 = control_codes.C0
+C1 = control_codes.C1_7B
+CSI = control_codes.CSI
+
+# Actions that change the terminal
+terminal_actions = (
+    actions.PutByte,
+    actions.PutByteSequence,
+    actions.PutCodePoint,
+    actions.PutString,
+    actions.KeyboardInput,
+)
+
+# Code points from 0x80 up all share the last column of the transition table
+n_columns = 0x81
+
 
 def empty_matrix(rows, columns, obj=None):
     row = [obj] * columns
@@ -15,230 +38,260 @@ def empty_matrix(rows, columns, obj=None):
 
 
 class Terminal(TerminalActions):
-    def handle_C0(self, C0):
-        if C0 is control_codes.C0.BS:
-            return self.backspace()
-        if C0 in (
-                control_codes.C0.LF,
-                control_codes.C0.VT,
-                control_codes.C0.FF,
-        ):
-            return self.line_feed()
-        elif C0 is control_codes.C0.CR:
-            return self.carriage_return()
-        elif C0 is control_codes.C0.ESC:
-            self.next_char_mode = NextCharMode.ESC
-            return self
-        elif C0 is control_codes.C0.HT:
-            return self.character_tabulation()
-
-        Logger.warning(f'Unhandled C0: {C0 !r}')
+    def warn_unhandled_C0(self, code_point):
+        Logger.warning(f'Unhandled C0: {C0(code_point) !r}')
         return self
 
-    def handle_C1(self, C1):
-        self.next_char_mode = NextCharMode.CHAR
-
-        if C1 is control_codes.C1_7B.CSI:
-            self.next_char_mode = NextCharMode.CSI
-            return self.reset_csi_buffer()
-        elif C1 in (
-                control_codes.C1_7B.APC,
-                control_codes.C1_7B.DCS,
-                control_codes.C1_7B.OSC,
-                control_codes.C1_7B.PM,
-                control_codes.C1_7B.SOS,
-        ):
-            self.next_char_mode = NextCharMode.STRING
-            return self.reset_string_buffer(C1)
-        elif C1 is control_codes.C1_7B.NEL:
-            return self.add_newline()
-        elif C1 is control_codes.C1_7B.HTS:
-            return self.horizontal_tabulation_set()
-        elif C1 is control_codes.C1_7B.RIS:
-            return self.reset()
-        elif C1 in (
-                control_codes.C1_7B.CS0,
-                control_codes.C1_7B.CS1,
-                control_codes.C1_7B.CS2,
-                control_codes.C1_7B.CS3,
-        ):
-            self.set_char_set_selection = C1
-            self.next_char_mode = NextCharMode.SET_CHAR_SET
-            return self
-
-        Logger.warning(f'Unhandled C1: {C1 !r}')
+    def warn_unhandled_C1(self, code_point):
+        Logger.warning(f'Unhandled C1: {C1(code_point) !r}')
         return self
 
-    def handle_char(self, code_point):
-        C0 = control_codes.C0(code_point)
-
-        if C0 is not None:
-            return self.handle_C0(C0)
+    def warn_unknown_esc(self, code_point):
+        Logger.warning(f'Unknown esc: %s' % hex(code_point))
+        return self
 
-        return self.add_char(code_point)
+    def warn_unknown_csi(self, code_point):
+        Logger.warning(f'Unknown csi: %s' % hex(code_point))
+        return self
 
-    def handle_esc(self, code_point):
-        C1 = control_codes.C1_7B(code_point)
+    def skip_csi(self, code_point):
+        Logger.warning('Skipping control sequence with intermediate byte '
+                       '(%s)' % hex(code_point))
+        return self.reset_csi_buffer()
 
-        if C1 is not None:
-            return self.handle_C1(C1)
+    def collect_csi(self, code_point):
+        self.csi_buffer.append(code_point)
+        return self
 
-        Logger.warning(f'Unknown esc: %s' % hex(code_point))
-        self.next_char_mode = NextCharMode.CHAR
+    def set_char_set(self, code_point):
+        self.set_char_set_selection = C1(code_point)
         return self
 
     def ignore_sgr(self, *args):
         return self
 
-    def get_csi_func(self, csi_type):
-        return {
-            control_codes.CSI.CUU: self.cursor_up,
-            control_codes.CSI.CUD: self.cursor_down,
-            control_codes.CSI.CUF: self.cursor_forward,
-            control_codes.CSI.CUB: self.cursor_backward,
-            control_codes.CSI.CNL: self.cursor_next_line,
-            control_codes.CSI.CPL: self.cursor_preceding_line,
-            control_codes.CSI.CHA: self.cursor_character_absolute,
-            control_codes.CSI.CUP: self.cursor_position,
-            control_codes.CSI.CHT: self.cursor_forward_tabulation,
-            control_codes.CSI.TBC: self.tabulation_clear,
-            control_codes.CSI.ECH: self.erase_character,
-            control_codes.CSI.ED: self.erase_in_page,
-            control_codes.CSI.EL: self.erase_in_line,
-            control_codes.CSI.VPA: self.line_position_absolute,
-            control_codes.CSI.VPB: self.line_position_backwards,
-            control_codes.CSI.VPR: self.line_position_forwards,
-            control_codes.CSI.SGR: self.ignore_sgr,  # TODO
-        }.get(csi_type)
-
-    def do_csi(self, csi):
-        csi_func = self.get_csi_func(csi.csi_type)
+    def parse_csi(self, csi_type, csi_func):
+        csi_string = ''.join(map(chr, self.csi_buffer))
+        csi = ParsedCSI(csi_type, csi_string)
+        self.reset_csi_buffer()
 
         if csi_func is None:
             Logger.warning(f'Unhandled csi: {csi}')
             return self
 
-        return csi_func(*csi.args)
-
-    def parse_csi(self):
-        self.next_char_mode = NextCharMode.CHAR
-        csi_string = ''.join(map(chr, self.csi_buffer[:-1]))
-        final_byte = control_codes.CSI(self.csi_buffer[-1])
-        csi = ParsedCSI(final_byte, csi_string)
-        return self \
-            .reset_csi_buffer() \
-            .do_csi(csi)
-
-    def handle_csi(self, code_point):
-        if code_point in range(0x20, 0x30):
-            Logger.warning('Skipping control sequence with intermediate byte '
-                           '(%s)' % hex(code_point))
-            self.next_char_mode = NextCharMode.CHAR
-            return self.reset_csi_buffer()
-
-        final_byte = control_codes.CSI(code_point)
-
-        if final_byte is not None or code_point in range(0x30, 0x40):
-            self.csi_buffer.append(code_point)
-
-            if final_byte is not None:
-                return self.parse_csi()
-
-            return self
-
-        Logger.warning(f'Unknown csi: %s' % hex(code_point))
-        return self
+        return csi_func(self, *csi.args)
 
     def parse_string_impl(self, string_type, string):
         Logger.info(f'Received string ({string_type !r}) {string !r}')
         return self
 
     def parse_string(self):
-        self.next_char_mode = NextCharMode.CHAR
         string_type = self.string_type
         string = ''.join(map(chr, self.string_buffer))
         return self \
             .reset_string_buffer() \
             .parse_string_impl(string_type, string)
 
-    def handle_string_C0(self, C0):
-        if C0 is control_codes.C0.BEL:
-            return self.parse_string()
-        elif C0 is control_codes.C0.ESC:
-            self.next_char_mode = NextCharMode.STRING_ESC
-            return self
-
-        return self
-
-    def handle_string(self, code_point):
-        C0 = control_codes.C0(code_point)
-
-        if C0 is not None:
-            return self.handle_string_C0(C0)
-
+    def collect_string(self, code_point):
         self.string_buffer.append(code_point)
         return self
 
-    def handle_string_esc(self, code_point):
-        if control_codes.C1_7B(code_point) is control_codes.C1_7B.ST:
-            return self.parse_string()
-        else:
-            # string interrupted
-            self.next_char_mode = NextCharMode.ESC
-            return self \
-                .reset_string_buffer() \
-                .handle_esc()
-
     def handle_set_char_set(self, code_point):
         Logger.info('Ignoring character set setting '
                     f'{self.set_char_set_selection !r} = {hex(code_point)}')
-        self.next_char_mode = NextCharMode.CHAR
         self.set_char_set_selection = None
         return self
 
-    @property
-    def put_char_func(self):
-        return {
-            NextCharMode.CHAR: self.handle_char,
-            NextCharMode.ESC: self.handle_esc,
-            NextCharMode.CSI: self.handle_csi,
-            NextCharMode.STRING: self.handle_string,
-            NextCharMode.STRING_ESC: self.handle_string_esc,
-            NextCharMode.SET_CHAR_SET: self.handle_set_char_set,
-        }[self.next_char_mode]
-
     def put_code_point(self, code_point):
-        return self.put_char_func(code_point)
+        action, self.next_char_mode = transitions[self.next_char_mode][
+            code_point if code_point < 0x80 else 0x80]
+        return action(self, code_point)
 
     def put_byte_sequence(self, byte_sequence):
-        self_chain = self
-
-        for code_point in self.unicode_buffer.add_bytes(*byte_sequence):
-            self_chain = self_chain.put_code_point(code_point)
-
-        return self_chain
+        return self.put_string(self.unicode_buffer.add_bytes(byte_sequence))
 
     def put_byte(self, byte):
-        return self.put_byte_sequence([byte])
+        return self.put_byte_sequence(bytes([byte]))
 
     def put_string(self, string):
         self_chain = self
+        position = 0
+
+        while position < len(string):
+            if self_chain.next_char_mode == NextCharMode.CHAR:
+                match = printable_run.match(string, position)
+
+                if match is not None:
+                    self_chain = self_chain.add_string(match.group())
+                    position = match.end()
+                    continue
+
+                match = line_break_run.match(string, position)
 
-        for code_point in map(ord, string):
-            self_chain = self_chain.put_code_point(code_point)
+                if match is not None:
+                    run = match.group()
+                    self_chain = self_chain.line_feed(
+                        len(run) - run.count('\r'))
+                    position = match.end()
+                    continue
+
+            self_chain = self_chain.put_code_point(ord(string[position]))
+            position += 1
 
         return self_chain
 
-    def reduce(self, action=None):
+    def reduce_in_place(self, action=None):
+        """Like reduce, but changes this terminal instead of a copy. The
+        result is usually self, but not always (RIS makes a new terminal)."""
         if isinstance(action, actions.PutByte):
-            return self.copy().put_byte(action.byte)
+            return self.put_byte(action.byte)
         if isinstance(action, actions.PutByteSequence):
-            return self.copy().put_byte_sequence(action.byte_sequence)
+            return self.put_byte_sequence(action.byte_sequence)
         if isinstance(action, actions.PutCodePoint):
-            return self.copy().put_code_point(action.code_point)
+            return self.put_code_point(action.code_point)
         elif isinstance(action, actions.PutString):
-            return self.copy().put_string(action.string)
+            return self.put_string(action.string)
         elif isinstance(action, actions.KeyboardInput):
-            return self.copy().put_string(action.keyboard_input)
+            return self.put_string(action.keyboard_input)
+
+        return self
+
+    def reduce(self, action=None):
+        if isinstance(action, terminal_actions):
+            return self.copy().reduce_in_place(action)
 
         return self
+
+
+def ignore(terminal, code_point):
+    return terminal
+
+
+def call(method, *args):
+    # Action for methods that do not take the code point
+    def action(terminal, code_point):
+        return method(terminal, *args)
+
+    return action
+
+
+def call_csi(csi_type, csi_func):
+    def action(terminal, code_point):
+        return terminal.parse_csi(csi_type, csi_func)
+
+    return action
+
+
+def interrupt_string(esc_action):
+    # ESC inside a string that does not start ST aborts the string and is
+    # handled like any other escape sequence
+    def action(terminal, code_point):
+        return esc_action(terminal.reset_string_buffer(), code_point)
+
+    return action
+
+
+csi_funcs = {
+    CSI.CUU: Terminal.cursor_up,
+    CSI.CUD: Terminal.cursor_down,
+    CSI.CUF: Terminal.cursor_forward,
+    CSI.CUB: Terminal.cursor_backward,
+    CSI.CNL: Terminal.cursor_next_line,
+    CSI.CPL: Terminal.cursor_preceding_line,
+    CSI.CHA: Terminal.cursor_character_absolute,
+    CSI.CUP: Terminal.cursor_position,
+    CSI.CHT: Terminal.cursor_forward_tabulation,
+    CSI.TBC: Terminal.tabulation_clear,
+    CSI.ECH: Terminal.erase_character,
+    CSI.ED: Terminal.erase_in_page,
+    CSI.EL: Terminal.erase_in_line,
+    CSI.VPA: Terminal.line_position_absolute,
+    CSI.VPB: Terminal.line_position_backwards,
+    CSI.VPR: Terminal.line_position_forwards,
+    CSI.SU: Terminal.scroll_up,
+    CSI.SGR: Terminal.ignore_sgr,  # TODO
+}
+
+
+def make_transitions():
+    """Build the (action, next state) table indexed by state and code point.
+
+    Actions are called as action(terminal, code_point) after the state
+    has been switched."""
+    def row(default):
+        return [default] * n_columns
+
+    char = row((Terminal.add_char, NextCharMode.CHAR))
+
+    for code_point in range(0x20):
+        char[code_point] = Terminal.warn_unhandled_C0, NextCharMode.CHAR
+
+    char[C0.BS] = call(Terminal.backspace), NextCharMode.CHAR
+    char[C0.LF] = call(Terminal.line_feed), NextCharMode.CHAR
+    char[C0.VT] = call(Terminal.line_feed), NextCharMode.CHAR
+    char[C0.FF] = call(Terminal.line_feed), NextCharMode.CHAR
+    char[C0.CR] = call(Terminal.carriage_return), NextCharMode.CHAR
+    char[C0.ESC] = ignore, NextCharMode.ESC
+    char[C0.HT] = call(Terminal.character_tabulation), NextCharMode.CHAR
+
+    esc = row((Terminal.warn_unknown_esc, NextCharMode.CHAR))
+
+    for code_point in C1:
+        esc[code_point] = Terminal.warn_unhandled_C1, NextCharMode.CHAR
+
+    esc[C1.CSI] = call(Terminal.reset_csi_buffer), NextCharMode.CSI
+
+    for string_type in C1.APC, C1.DCS, C1.OSC, C1.PM, C1.SOS:
+        esc[string_type] = (
+            call(Terminal.reset_string_buffer, string_type),
+            NextCharMode.STRING,
+        )
+
+    esc[C1.NEL] = call(Terminal.line_feed), NextCharMode.CHAR
+    esc[C1.HTS] = call(Terminal.horizontal_tabulation_set), NextCharMode.CHAR
+    esc[C1.RIS] = call(Terminal.reset), NextCharMode.CHAR
+
+    for code_point in C1.CS0, C1.CS1, C1.CS2, C1.CS3:
+        esc[code_point] = Terminal.set_char_set, NextCharMode.SET_CHAR_SET
+
+    csi = row((Terminal.warn_unknown_csi, NextCharMode.CSI))
+
+    for code_point in range(0x20, 0x30):
+        csi[code_point] = Terminal.skip_csi, NextCharMode.CHAR
+
+    for code_point in range(0x30, 0x40):
+        csi[code_point] = Terminal.collect_csi, NextCharMode.CSI
+
+    for csi_type in CSI:
+        csi[csi_type] = (
+            call_csi(csi_type, csi_funcs.get(csi_type)),
+            NextCharMode.CHAR,
+        )
+
+    string = row((Terminal.collect_string, NextCharMode.STRING))
+
+    for code_point in range(0x20):
+        string[code_point] = ignore, NextCharMode.STRING
+
+    string[C0.BEL] = call(Terminal.parse_string), NextCharMode.CHAR
+    string[C0.ESC] = ignore, NextCharMode.STRING_ESC
+
+    string_esc = [
+        (interrupt_string(action), next_char_mode)
+        for action, next_char_mode in esc
+    ]
+    string_esc[C1.ST] = call(Terminal.parse_string), NextCharMode.CHAR
+
+    set_char_set = row((Terminal.handle_set_char_set, NextCharMode.CHAR))
+
+    transitions = [None] * 6
+    transitions[NextCharMode.CHAR] = char
+    transitions[NextCharMode.ESC] = esc
+    transitions[NextCharMode.CSI] = csi
+    transitions[NextCharMode.STRING] = string
+    transitions[NextCharMode.STRING_ESC] = string_esc
+    transitions[NextCharMode.SET_CHAR_SET] = set_char_set
+    return transitions
+
+
+transitions = make_transitions()
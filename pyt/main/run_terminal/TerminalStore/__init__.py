@@ -1,27 +1,135 @@
+import time
 import redux
+from .... import actions
+from .... import config
 from ....Logger import Logger
+from .ScreenDelta import ScreenDelta
 from .Terminal import Terminal
 
 __all__ = 'TerminalStore'
 
 
 class TerminalStore(redux.Store):
-    def __init__(self, terminal_queue, redraw_event):
+    def __init__(self, terminal_queue=None, redraw_event=None,
+                 in_place=None, fps=None, shared_screen=None,
+                 action_log_size=None, snapshot_interval=None):
         super().__init__(Terminal())
         self.terminal_queue = terminal_queue
         self.redraw_event = redraw_event
-        self.sub_queue_state()
+        self.shared_screen = shared_screen
+
+        if in_place is None:
+            in_place = config.reduce_in_place
+
+        if fps is None:
+            fps = config.fps
+
+        if action_log_size is None:
+            action_log_size = config.action_log_size
+
+        if snapshot_interval is None:
+            snapshot_interval = config.action_log_snapshot_interval
+
+        self.in_place = in_place
+        self.frame_interval = 1 / fps if fps else 0
+        self.frame_time = float('-inf')
+        self.frame_pending = False
+        self.n_frames = 0
+
+        if action_log_size:
+            self.record(snapshot_interval, action_log_size)
+
+        if terminal_queue is not None or shared_screen is not None:
+            self.sub_queue_state()
+
         self.sub_log_state()
 
+    def dispatch(self, action):
+        if not self.in_place:
+            super().dispatch(action)
+            return
+
+        # Nobody holds on to the previous state, so there is nothing to copy
+        self.state = self.state.reduce_in_place(action)
+
+        if self.action_log is not None:
+            self.log_action(action)
+
+        self._do_subscriptions()
+
+    def snapshot(self):
+        """Return a state that later dispatches do not change."""
+        if self.in_place:
+            return self.state.snapshot()
+
+        return self.state
+
+    def log_action(self, action):
+        # Views into the byte ring are overwritten once the ring moves on
+        if isinstance(action, actions.PutByteSequence) \
+                and isinstance(action.byte_sequence, memoryview):
+            action = actions.PutByteSequence(bytes(action.byte_sequence))
+
+        super().log_action(action)
+
+    def state_at(self, index):
+        state, logged_actions = self.action_log.seek(index)
+        # Replayed on a copy of the snapshot, which gets a scrollback of its
+        # own rather than adding lines to the one every state shares
+        state = state.snapshot()
+        scrollback = state.scrollback
+        state.scrollback = type(scrollback)(scrollback.max_lines,
+                                            scrollback.max_bytes)
+
+        for action in logged_actions:
+            state = state.reduce_in_place(action)
+
+        return state
+
+    def frame_timeout(self):
+        """Return the seconds until the pending state is due to be queued,
+        or None if there is none."""
+        if not self.frame_pending:
+            return None
+
+        return max(self.frame_time + self.frame_interval - time.monotonic(), 0)
+
+    def is_keyframe(self):
+        if self.n_frames == 0:
+            return True
+
+        interval = config.keyframe_interval
+        return bool(interval) and self.n_frames % interval == 0
+
     def queue_state(self):
-        self.terminal_queue.put(self.state)
+        if self.shared_screen is not None:
+            self.shared_screen.write(self.state)
+        else:
+            # Only the rows damaged since the last delta are copied, the
+            # queue pickles them in a background thread after dispatch
+            # returns
+            _, dirty_rows = self.state.take_damage()
+            self.terminal_queue.put(ScreenDelta.from_terminal(
+                self.state, dirty_rows, self.is_keyframe()))
+            self.n_frames += 1
+
         self.redraw_event.set()
+        self.frame_time = time.monotonic()
+        self.frame_pending = False
+
+    def pace_state(self):
+        # Queued right away if a frame interval has passed since the last
+        # one, otherwise left pending for whoever waits on frame_timeout
+        self.frame_pending = True
+
+        if self.frame_timeout() == 0:
+            self.queue_state()
 
     def log_state(self):
         Logger.debug(self.state)
 
     def sub_queue_state(self):
-        self._unsub_queue_state = super().subscribe(self.queue_state)
+        self._unsub_queue_state = super().subscribe(self.pace_state)
 
     def unsub_queue_state(self):
         self._unsub_queue_state()
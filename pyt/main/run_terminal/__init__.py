@@ -1,3 +1,6 @@
+import io
+import queue
+import time
 from ... import actions
 from ...Logger import Logger
 from ...make_process import make_process
@@ -6,21 +9,73 @@ from .TerminalStore import TerminalStore
 __all__ = 'run_terminal'
 
 
+def pending_actions(action_queue, action, deadline, quit_event):
+    # The action in hand, then whatever else is already queued, until the
+    # next frame is due
+    yield action
+
+    while time.monotonic() < deadline and not quit_event.is_set():
+        try:
+            yield action_queue.get(block=False)
+        except queue.Empty:
+            return
+
+
+def ring_slices(byte_ring, max_bytes, deadline, quit_event):
+    # The first slice of the bytes in the ring, then more until the next
+    # frame is due. The slice it stops at stays in the ring.
+    for n_slices, byte_sequence in enumerate(byte_ring.read(max_bytes)):
+        if quit_event.is_set() or n_slices and time.monotonic() >= deadline:
+            return
+
+        yield byte_sequence
+
+
 @make_process
-def run_terminal(terminal_queue, redraw_event, action_queue, write_queue):
+def run_terminal(terminal_queue, redraw_event, action_queue, write_queue,
+                 quit_event, byte_ring=None, shared_screen=None):
     Logger.debug('run_terminal')
-    store = TerminalStore(terminal_queue, redraw_event)
+    store = TerminalStore(terminal_queue, redraw_event,
+                          shared_screen=shared_screen)
+    buf_size = io.DEFAULT_BUFFER_SIZE
 
-    while True:
-        action = action_queue.get()
-        Logger.debug(action)
+    while not quit_event.is_set():
+        # Only waits with a timeout while a state is pending, so being idle
+        # costs nothing
+        try:
+            action = action_queue.get(timeout=store.frame_timeout())
+        except queue.Empty:
+            store.queue_state()
+            continue
+
+        # Subscribers hear about the whole batch once
+        with store.batch():
+            deadline = time.monotonic() + store.frame_interval
+
+            for action in pending_actions(action_queue, action, deadline,
+                                          quit_event):
+                Logger.debug(action)
+
+                if isinstance(action, actions.Quit):
+                    break
+                elif isinstance(action, actions.KeyboardInput):
+                    write_queue.put(action.keyboard_input.encode())
+                elif isinstance(action, actions.ReadByteRing):
+                    # Slices small enough that Quit and the frame pacing get
+                    # a look in between them
+                    for byte_sequence in ring_slices(byte_ring, buf_size,
+                                                     deadline, quit_event):
+                        store.dispatch(actions.PutByteSequence(byte_sequence))
+
+                    # While output keeps coming the ring never runs dry, so
+                    # the rest is read after this batch's frame, behind
+                    # whatever was queued meanwhile
+                    if byte_ring.unread():
+                        action_queue.put(actions.ReadByteRing())
+                else:
+                    store.dispatch(action)
 
         if isinstance(action, actions.Quit):
             break
-        elif isinstance(action, actions.KeyboardInput):
-            write_queue.put(action.keyboard_input.encode())
-            continue
-
-        store.dispatch(action)
 
     Logger.debug('run_terminal done')
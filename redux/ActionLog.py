@@ -0,0 +1,74 @@
+import collections
+
+__all__ = 'ActionLog',
+
+
+class ActionLog:
+    """Dispatched actions, with a snapshot of the state every
+    snapshot_interval of them, so any logged state is at most that many
+    reduces away.
+
+    Indices count the actions since logging started: state 0 is the state it
+    started from and state i is the one after the i-th action. With a maxlen
+    at least the last maxlen actions are kept, older ones are dropped
+    snapshot_interval at a time along with the snapshot they start from."""
+
+    def __init__(self, initial_state, snapshot_interval=1000, maxlen=None):
+        if snapshot_interval < 1:
+            raise ValueError('snapshot_interval must be at least 1')
+
+        self.snapshot_interval = snapshot_interval
+        self.maxlen = maxlen
+        # (snapshot, actions reduced from it) pairs, oldest first
+        self.chunks = collections.deque([(initial_state, [])])
+        self.start = 0
+        self.stop = 0
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __iter__(self):
+        for _, actions in self.chunks:
+            yield from actions
+
+    def __repr__(self):
+        qualname = self.__class__.__qualname__
+        return (f'{qualname}({self.start}:{self.stop}, snapshot_interval='
+                f'{self.snapshot_interval !r}, maxlen={self.maxlen !r})')
+
+    def append(self, action, snapshot):
+        """Log an action. snapshot is called for the state after it when a
+        snapshot is due."""
+        actions = self.chunks[-1][1]
+        actions.append(action)
+        self.stop += 1
+
+        if len(actions) < self.snapshot_interval:
+            return self
+
+        self.chunks.append((snapshot(), []))
+
+        if self.maxlen is not None \
+                and len(self) - self.snapshot_interval >= self.maxlen:
+            self.chunks.popleft()
+            self.start += self.snapshot_interval
+
+        return self
+
+    def seek(self, index):
+        """Return the closest snapshot at or before state index and the
+        actions that lead from it to that state."""
+        if not self.start <= index <= self.stop:
+            raise IndexError('action log index out of range')
+
+        n_chunks, n_actions = divmod(index - self.start, self.snapshot_interval)
+        state, actions = self.chunks[n_chunks]
+        return state, actions[:n_actions]
+
+    def state_at(self, index):
+        state, actions = self.seek(index)
+
+        for action in actions:
+            state = state.reduce(action)
+
+        return state
@@ -1,15 +1,71 @@
+import contextlib
+from .ActionLog import ActionLog
+
+
 class Store:
     def __init__(self, initial_state):
         self.state = initial_state
         self.subscriptions = []
+        self.batch_depth = 0
+        self.batch_pending = False
+        self.action_log = None
 
     def _do_subscriptions(self):
+        if self.batch_depth:
+            self.batch_pending = True
+            return
+
         for subscription in self.subscriptions:
             subscription()
 
     def dispatch(self, action):
-        self.state = self.state.reduce(action)
-        self._do_subscriptions()
+        state = self.state
+        self.state = state.reduce(action)
+
+        if self.action_log is not None:
+            self.log_action(action)
+
+        # Inside a batch, actions that leave the state as it was are not
+        # worth a call at the end
+        if not self.batch_depth or self.state is not state:
+            self._do_subscriptions()
+
+    def dispatch_many(self, actions):
+        with self.batch():
+            for action in actions:
+                self.dispatch(action)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Hold back the subscriptions until the outermost batch ends, then
+        call them once if any action in it changed the state."""
+        self.batch_depth += 1
+
+        try:
+            yield self
+        finally:
+            self.batch_depth -= 1
+
+            if not self.batch_depth and self.batch_pending:
+                self.batch_pending = False
+                self._do_subscriptions()
+
+    def snapshot(self):
+        """Return a state that later dispatches do not change."""
+        return self.state
+
+    def record(self, snapshot_interval=1000, maxlen=None):
+        """Start logging the dispatched actions, from the current state."""
+        self.action_log = ActionLog(self.snapshot(), snapshot_interval, maxlen)
+        return self.action_log
+
+    def log_action(self, action):
+        self.action_log.append(action, self.snapshot)
+
+    def state_at(self, index):
+        """Return the state after the index-th logged action, replayed from
+        the closest snapshot before it."""
+        return self.action_log.state_at(index)
 
     def subscribe(self, callback):
         self.subscriptions.append(callback)
@@ -1,7 +1,13 @@
+from .persistent import *
+from .persistent import __all__ as _persistent_all
 from .reducer_utils import *
 from .reducer_utils import __all__ as _reducer_utils_all
+from .ActionLog import ActionLog
 from .Reducer import Reducer
 from .Store import Store
 from .selector import selector
 
-__all__ = 'Reducer', 'Store', 'selector', *_reducer_utils_all
+__all__ = (
+    'ActionLog', 'Reducer', 'Store', 'selector', *_persistent_all,
+    *_reducer_utils_all,
+)
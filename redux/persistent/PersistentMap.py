@@ -0,0 +1,341 @@
+import collections.abc
+import copy
+
+__all__ = 'PersistentMap',
+
+bits = 5
+mask = (1 << bits) - 1
+hash_mask = (1 << 64) - 1
+
+_missing = object()
+
+
+def key_hash(key):
+    return hash(key) & hash_mask
+
+
+def bit_count(n):
+    return bin(n).count('1')
+
+
+# Entries are either (hash, key, value) leaves or child nodes
+
+
+class BitmapNode:
+    """Up to 32 entries, one per 5-bit slice of the hash at this level, with
+    bitmap marking which slices are there."""
+    __slots__ = 'bitmap', 'entries'
+
+    def __init__(self, bitmap, entries):
+        self.bitmap = bitmap
+        self.entries = entries
+
+    def find(self, shift, h, key):
+        bit = 1 << ((h >> shift) & mask)
+
+        if not self.bitmap & bit:
+            return _missing
+
+        entry = self.entries[bit_count(self.bitmap & (bit - 1))]
+
+        if type(entry) is not tuple:
+            return entry.find(shift + bits, h, key)
+
+        entry_hash, entry_key, value = entry
+
+        if entry_hash == h and (entry_key is key or entry_key == key):
+            return value
+
+        return _missing
+
+    def assoc(self, shift, leaf):
+        """Return the node with leaf added, and whether its key is new."""
+        h, key, value = leaf
+        bit = 1 << ((h >> shift) & mask)
+        index = bit_count(self.bitmap & (bit - 1))
+        entries = self.entries
+
+        if not self.bitmap & bit:
+            entries = entries[:index] + (leaf,) + entries[index:]
+            return BitmapNode(self.bitmap | bit, entries), True
+
+        entry = entries[index]
+
+        if type(entry) is not tuple:
+            child, added = entry.assoc(shift + bits, leaf)
+
+            if child is entry:
+                return self, False
+        else:
+            entry_hash, entry_key, entry_value = entry
+
+            if entry_hash == h and (entry_key is key or entry_key == key):
+                if entry_value is value:
+                    return self, False
+
+                child, added = leaf, False
+            else:
+                child, added = merge(shift + bits, entry, leaf), True
+
+        entries = entries[:index] + (child,) + entries[index + 1:]
+        return BitmapNode(self.bitmap, entries), added
+
+    def dissoc(self, shift, h, key):
+        """Return the node without key, a lone leaf left for the parent to
+        take in, or None once empty."""
+        bit = 1 << ((h >> shift) & mask)
+
+        if not self.bitmap & bit:
+            return self
+
+        index = bit_count(self.bitmap & (bit - 1))
+        entry = self.entries[index]
+
+        if type(entry) is not tuple:
+            child = entry.dissoc(shift + bits, h, key)
+
+            if child is entry:
+                return self
+        else:
+            entry_hash, entry_key, _ = entry
+
+            if entry_hash != h or not (entry_key is key or entry_key == key):
+                return self
+
+            child = None
+
+        if child is not None:
+            if len(self.entries) == 1 and type(child) is tuple:
+                return child
+
+            entries = self.entries[:index] + (child,) \
+                + self.entries[index + 1:]
+            return BitmapNode(self.bitmap, entries)
+
+        entries = self.entries[:index] + self.entries[index + 1:]
+
+        if not entries:
+            return None
+
+        if len(entries) == 1 and type(entries[0]) is tuple:
+            return entries[0]
+
+        return BitmapNode(self.bitmap ^ bit, entries)
+
+    def leaves(self):
+        for entry in self.entries:
+            if type(entry) is tuple:
+                yield entry
+            else:
+                yield from entry.leaves()
+
+
+class CollisionNode:
+    """Leaves whose whole hashes are the same."""
+    __slots__ = 'hash', 'entries'
+
+    def __init__(self, h, entries):
+        self.hash = h
+        self.entries = entries
+
+    def _index(self, key):
+        for index, (_, entry_key, _) in enumerate(self.entries):
+            if entry_key is key or entry_key == key:
+                return index
+
+        return None
+
+    def find(self, shift, h, key):
+        if h == self.hash:
+            index = self._index(key)
+
+            if index is not None:
+                return self.entries[index][2]
+
+        return _missing
+
+    def assoc(self, shift, leaf):
+        h, key, value = leaf
+
+        if h != self.hash:
+            bit = 1 << ((self.hash >> shift) & mask)
+            return BitmapNode(bit, (self,)).assoc(shift, leaf)
+
+        index = self._index(key)
+
+        if index is None:
+            return CollisionNode(h, self.entries + (leaf,)), True
+
+        if self.entries[index][2] is value:
+            return self, False
+
+        entries = self.entries[:index] + (leaf,) + self.entries[index + 1:]
+        return CollisionNode(h, entries), False
+
+    def dissoc(self, shift, h, key):
+        index = self._index(key) if h == self.hash else None
+
+        if index is None:
+            return self
+
+        entries = self.entries[:index] + self.entries[index + 1:]
+
+        if len(entries) == 1:
+            return entries[0]
+
+        return CollisionNode(h, entries)
+
+    def leaves(self):
+        return iter(self.entries)
+
+
+def merge(shift, leaf, other_leaf):
+    # Node holding two leaves that share the hash bits below shift
+    h = leaf[0]
+    other_h = other_leaf[0]
+
+    if h == other_h:
+        return CollisionNode(h, (leaf, other_leaf))
+
+    index = (h >> shift) & mask
+    other_index = (other_h >> shift) & mask
+
+    if index == other_index:
+        return BitmapNode(1 << index,
+                          (merge(shift + bits, leaf, other_leaf),))
+
+    if index > other_index:
+        leaf, other_leaf = other_leaf, leaf
+
+    return BitmapNode(1 << index | 1 << other_index, (leaf, other_leaf))
+
+
+def nodes_equal(node, other_node):
+    # Subtrees the two maps share are equal without looking inside
+    if node is other_node:
+        return True
+
+    if type(node) is BitmapNode and type(other_node) is BitmapNode \
+            and node.bitmap == other_node.bitmap:
+        return all(
+            nodes_equal(entry, other_entry)
+            if type(entry) is not tuple and type(other_entry) is not tuple
+            else entry == other_entry
+            for entry, other_entry in zip(node.entries, other_node.entries)
+        )
+
+    # Nodes shaped differently, by deletes or collisions, can still hold
+    # the same leaves
+    if type(node) is tuple:
+        node = BitmapNode(0, (node,))
+
+    if type(other_node) is tuple:
+        other_node = BitmapNode(0, (other_node,))
+
+    leaves = {key: value for _, key, value in node.leaves()}
+    other_leaves = {key: value for _, key, value in other_node.leaves()}
+    return leaves == other_leaves
+
+
+class PersistentMap(collections.abc.Mapping):
+    """Immutable dict as a hash array mapped trie.
+
+    set and delete return a new map that shares every node off the path to
+    the key with the original, so they cost O(log32 n) and older versions
+    stay valid."""
+    __slots__ = '_root', '_len'
+
+    def __new__(cls, items=(), **kwargs):
+        self = cls._empty
+
+        for key, value in dict(items, **kwargs).items():
+            self = self.set(key, value)
+
+        return self
+
+    @classmethod
+    def _node(cls, root, length):
+        self = object.__new__(cls)
+        self._root = root
+        self._len = length
+        return self
+
+    def set(self, key, value):
+        """Return a map with key set to value."""
+        root, added = self._root.assoc(0, (key_hash(key), key, value))
+
+        if root is self._root:
+            return self
+
+        return self._node(root, self._len + added)
+
+    def delete(self, key):
+        """Return the map without key."""
+        root = self._root.dissoc(0, key_hash(key), key)
+
+        if root is self._root:
+            raise KeyError(key)
+
+        if root is None:
+            return self._empty
+
+        # The root stays a node even with a single leaf left
+        if type(root) is tuple:
+            root = BitmapNode(1 << (root[0] & mask), (root,))
+
+        return self._node(root, self._len - 1)
+
+    def update(self, items=(), **kwargs):
+        """Return a map with the items added, like dict.update."""
+        self_chain = self
+
+        for key, value in dict(items, **kwargs).items():
+            self_chain = self_chain.set(key, value)
+
+        return self_chain
+
+    def __getitem__(self, key):
+        value = self._root.find(0, key_hash(key), key)
+
+        if value is _missing:
+            raise KeyError(key)
+
+        return value
+
+    def get(self, key, default=None):
+        value = self._root.find(0, key_hash(key), key)
+        return default if value is _missing else value
+
+    def __contains__(self, key):
+        return self._root.find(0, key_hash(key), key) is not _missing
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for _, key, _ in self._root.leaves():
+            yield key
+
+    def __eq__(self, other):
+        if isinstance(other, PersistentMap):
+            return self._len == other._len \
+                and nodes_equal(self._root, other._root)
+
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'{type(self).__qualname__}({dict(self.items()) !r})'
+
+    def __reduce__(self):
+        return type(self), (dict(self.items()),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return type(self)(copy.deepcopy(dict(self.items()), memo))
+
+
+PersistentMap._empty = PersistentMap._node(BitmapNode(0, ()), 0)
@@ -0,0 +1,112 @@
+import collections.abc
+import copy
+import itertools
+
+__all__ = 'PersistentStack',
+
+
+class PersistentStack(collections.abc.Sequence):
+    """Immutable stack as a linked list, each stack sharing everything below
+    its top with the one it was pushed onto.
+
+    push and pop are O(1) and leave the original untouched, so older states
+    stay valid snapshots. As a sequence it reads bottom to top, like the
+    list it replaces, and indexing from the top is the cheap end."""
+    __slots__ = '_top', '_rest', '_len'
+
+    def __new__(cls, items=()):
+        stack = cls._empty
+
+        for item in items:
+            stack = stack.push(item)
+
+        return stack
+
+    @classmethod
+    def _node(cls, top, rest, length):
+        self = object.__new__(cls)
+        self._top = top
+        self._rest = rest
+        self._len = length
+        return self
+
+    def push(self, item):
+        return self._node(item, self, self._len + 1)
+
+    def pop(self):
+        """Return the stack without its top."""
+        if not self._len:
+            raise IndexError('pop from empty stack')
+
+        return self._rest
+
+    @property
+    def top(self):
+        if not self._len:
+            raise IndexError('top of empty stack')
+
+        return self._top
+
+    def __len__(self):
+        return self._len
+
+    def __reversed__(self):
+        stack = self
+
+        while stack._len:
+            yield stack._top
+            stack = stack._rest
+
+    def __iter__(self):
+        return reversed(list(reversed(self)))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+
+        if index < 0:
+            index += self._len
+
+        if not 0 <= index < self._len:
+            raise IndexError('stack index out of range')
+
+        n_from_top = self._len - 1 - index
+        return next(itertools.islice(reversed(self), n_from_top, None))
+
+    def __eq__(self, other):
+        if isinstance(other, PersistentStack):
+            if self._len != other._len:
+                return False
+
+            # Stacks that share a tail are equal from there down
+            while self is not other:
+                if self._top != other._top:
+                    return False
+
+                self = self._rest
+                other = other._rest
+
+            return True
+
+        if isinstance(other, list):
+            return list(self) == other
+
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'{type(self).__qualname__}({list(self) !r})'
+
+    # Walking the nodes one by one would recurse once per item
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return type(self)(copy.deepcopy(list(self), memo))
+
+
+PersistentStack._empty = PersistentStack._node(None, None, 0)
@@ -0,0 +1,232 @@
+import collections.abc
+import copy
+
+__all__ = 'PersistentVector',
+
+bits = 5
+width = 1 << bits
+mask = width - 1
+
+
+def new_path(level, node):
+    while level:
+        node = node,
+        level -= bits
+
+    return node
+
+
+def nodes_equal(level, node, other_node):
+    # Subtrees the two vectors share are equal without looking inside
+    if node is other_node:
+        return True
+
+    if not level:
+        return node == other_node
+
+    return all(
+        nodes_equal(level - bits, child, other_child)
+        for child, other_child in zip(node, other_node)
+    )
+
+
+class PersistentVector(collections.abc.Sequence):
+    """Immutable list as a trie of 32-item tuples, with the last items in a
+    separate tail.
+
+    set, append and pop return a new vector that shares every node off the
+    path they change with the original, so they cost O(log32 n) and older
+    versions stay valid. Appending to and popping from the end mostly only
+    touches the tail."""
+    __slots__ = '_len', '_shift', '_root', '_tail'
+
+    def __new__(cls, items=()):
+        items = list(items)
+        vector = cls._empty
+        n_leaves = max(len(items) - 1, 0) // width
+
+        for start in range(0, n_leaves * width, width):
+            vector = vector._push_leaf(tuple(items[start:start + width]))
+
+        tail = tuple(items[n_leaves * width:])
+        return cls._node(len(items), vector._shift, vector._root, tail)
+
+    @classmethod
+    def _node(cls, length, shift, root, tail):
+        self = object.__new__(cls)
+        self._len = length
+        self._shift = shift
+        self._root = root
+        self._tail = tail
+        return self
+
+    def _tail_offset(self):
+        return self._len - len(self._tail)
+
+    def _leaf(self, index):
+        if index >= self._tail_offset():
+            return self._tail
+
+        node = self._root
+
+        for level in range(self._shift, 0, -bits):
+            node = node[(index >> level) & mask]
+
+        return node
+
+    def _index(self, index):
+        if index < 0:
+            index += self._len
+
+        if not 0 <= index < self._len:
+            raise IndexError('vector index out of range')
+
+        return index
+
+    def _push_leaf(self, leaf):
+        # leaf goes after the last one in the trie, so its index is the
+        # current length
+        length = self._len + len(leaf)
+        shift = self._shift
+
+        if (self._len >> bits) >= 1 << shift:
+            root = self._root, new_path(shift, leaf)
+            shift += bits
+        else:
+            root = self._push_tail(shift, self._root, leaf)
+
+        return self._node(length, shift, root, ())
+
+    def _push_tail(self, level, node, leaf):
+        index = (self._len >> level) & mask
+
+        if level == bits:
+            child = leaf
+        elif index < len(node):
+            child = self._push_tail(level - bits, node[index], leaf)
+        else:
+            child = new_path(level - bits, leaf)
+
+        return node[:index] + (child,) + node[index + 1:]
+
+    def _pop_tail(self, level, node):
+        index = ((self._len - 2) >> level) & mask
+
+        if level > bits:
+            child = self._pop_tail(level - bits, node[index])
+
+            if child is None and not index:
+                return None
+
+            if child is None:
+                return node[:index]
+
+            return node[:index] + (child,)
+
+        if not index:
+            return None
+
+        return node[:index]
+
+    def _set_in(self, level, node, index, item):
+        child_index = (index >> level) & mask
+
+        if level:
+            child = self._set_in(level - bits, node[child_index], index, item)
+        else:
+            child = item
+
+        return node[:child_index] + (child,) + node[child_index + 1:]
+
+    def set(self, index, item):
+        """Return a vector with item at index."""
+        index = self._index(index)
+
+        if self._leaf(index)[index & mask] is item:
+            return self
+
+        if index >= self._tail_offset():
+            tail_index = index - self._tail_offset()
+            tail = self._tail[:tail_index] + (item,) \
+                + self._tail[tail_index + 1:]
+            return self._node(self._len, self._shift, self._root, tail)
+
+        root = self._set_in(self._shift, self._root, index, item)
+        return self._node(self._len, self._shift, root, self._tail)
+
+    def append(self, item):
+        if len(self._tail) < width:
+            return self._node(self._len + 1, self._shift, self._root,
+                              self._tail + (item,))
+
+        vector = self._node(self._tail_offset(), self._shift, self._root, ())
+        vector = vector._push_leaf(self._tail)
+        return self._node(self._len + 1, vector._shift, vector._root,
+                          (item,))
+
+    def pop(self):
+        """Return the vector without its last item."""
+        if not self._len:
+            raise IndexError('pop from empty vector')
+
+        if self._len == 1:
+            return self._empty
+
+        if len(self._tail) > 1:
+            return self._node(self._len - 1, self._shift, self._root,
+                              self._tail[:-1])
+
+        tail = self._leaf(self._len - 2)
+        root = self._pop_tail(self._shift, self._root) or ()
+        shift = self._shift
+
+        if shift > bits and len(root) == 1:
+            root = root[0]
+            shift -= bits
+
+        return self._node(self._len - 1, shift, root, tail)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for start in range(0, self._tail_offset(), width):
+            yield from self._leaf(start)
+
+        yield from self._tail
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+
+        index = self._index(index)
+        return self._leaf(index)[index & mask]
+
+    def __eq__(self, other):
+        if isinstance(other, PersistentVector):
+            return self._len == other._len \
+                and self._shift == other._shift \
+                and nodes_equal(self._shift, self._root, other._root) \
+                and self._tail == other._tail
+
+        if isinstance(other, list):
+            return list(self) == other
+
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'{type(self).__qualname__}({list(self) !r})'
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return type(self)(copy.deepcopy(list(self), memo))
+
+
+PersistentVector._empty = PersistentVector._node(0, bits, (), ())
@@ -0,0 +1,5 @@
+from .PersistentMap import PersistentMap
+from .PersistentStack import PersistentStack
+from .PersistentVector import PersistentVector
+
+__all__ = 'PersistentMap', 'PersistentStack', 'PersistentVector'
@@ -1,29 +1,40 @@
 __all__ = 'CombineReducers',
 
 
-class CombineReducers:
-    @classmethod
-    def _annotations(cls):
+class CombineReducersMeta(type):
+    def __new__(cls, name, bases, namespace, **kwargs):
+        self = super().__new__(cls, name, bases, namespace, **kwargs)
         annotations = {}
 
-        for base in reversed(cls.mro()):
+        for base in reversed(self.mro()):
             annotations.update(getattr(base, '__annotations__', {}))
 
-        return annotations
+        # (field, reduce) pairs, worked out once per class instead of for
+        # every action
+        self._reducers = tuple(
+            (field, type_hint.reduce)
+            for field, type_hint in annotations.items()
+        )
+        return self
 
-    @property
-    def _type_hint_dict(self):
-        get_type_hint = self._annotations().get
-        return {
-            field: (get_type_hint(field), value)
-            for field, value in vars(self).items()
-        }
 
+class CombineReducers(metaclass=CombineReducersMeta):
     def reduce(self, action=None):
-        new_dict = {
-            field: type_hint.reduce(value, action)
-            for field, (type_hint, value) in self._type_hint_dict.items()
-        }
+        new_dict = None
 
-        new_data = type(self)(**new_dict)
-        return self if self == new_data else new_data
+        for field, reduce in self._reducers:
+            value = getattr(self, field)
+            new_value = reduce(value, action)
+
+            if new_value is value:
+                continue
+
+            if new_dict is None:
+                new_dict = vars(self).copy()
+
+            new_dict[field] = new_value
+
+        if new_dict is None:
+            return self
+
+        return type(self)(**new_dict)
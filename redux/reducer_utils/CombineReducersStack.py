@@ -1,18 +1,20 @@
 import dataclasses
+from ..persistent import PersistentStack
 from ..Reducer import Reducer
-from .CombineReducers import CombineReducers
+from .CombineReducers import CombineReducers, CombineReducersMeta
 from .init_reducers import init_reducers
 from . import stack_actions
 
 __all__ = 'CombineReducersStack',
 
 
-class Stack(Reducer[list]):
-    field = dataclasses.field(default_factory=list)
+class Stack(Reducer[PersistentStack]):
+    field = dataclasses.field(default_factory=PersistentStack)
 
     def reduce(state=None, action=None):
-        if state is None or isinstance(action, stack_actions.Clear):
-            state = []
+        if state is None or (isinstance(action, stack_actions.Clear)
+                             and state):
+            state = PersistentStack()
 
         return state
 
@@ -25,13 +27,12 @@ class CombineReducersStackBase(CombineReducers):
     def stack_update(self, action=None):
         if isinstance(action, stack_actions.Push):
             entry = self._stack_entry(**vars(self))
-            return {'stack': [*self.stack, entry]}
+            return {'stack': self.stack.push(entry)}
         elif isinstance(action, stack_actions.Pop):
             if not self.stack:
                 return self
 
-            *stack, entry = self.stack
-            return {'stack': stack, **vars(entry)}
+            return {'stack': self.stack.pop(), **vars(self.stack.top)}
 
         return self
 
@@ -53,7 +54,7 @@ class IgnoreStackMixin:
         super().__init__(*args, **kwargs)
 
 
-class CombineReducersStackMeta(type):
+class CombineReducersStackMeta(CombineReducersMeta):
     def __new__(cls, name, bases, namespace):
         self = super().__new__(cls, name, bases, namespace)
         new_namespace = namespace.copy()
@@ -37,25 +37,50 @@ class MergeReducers(metaclass=MergeReducersMeta):
             for key in keys
         }
 
+    # One instance per slice, in the order of reducers. Built the first time
+    # it is needed and handed on by reduce, so slices that did not change
+    # are never rebuilt.
+    def _get_slices(self):
+        slices = self.__dict__.get('_slices')
+
+        if slices is None:
+            slices = tuple(
+                reducer(**self._dict_slice(field_names))
+                for reducer, field_names in self.reducers.values()
+            )
+            # Past the frozen __setattr__
+            object.__setattr__(self, '_slices', slices)
+
+        return slices
+
     def reduce(self, action=None):
-        data_slices = {
-            name: reducer(**self._dict_slice(field_names))
-            for name, (reducer, field_names) in self.reducers.items()
-        }
-        new_data_slices = {
-            name: (data_slice, data_slice.reduce(action))
-            for name, data_slice in data_slices.items()
-        }
+        slices = self._get_slices()
+        new_slices = None
+
+        for i, data_slice in enumerate(slices):
+            new_data_slice = data_slice.reduce(action)
+
+            if new_data_slice is data_slice:
+                continue
+
+            if new_slices is None:
+                new_slices = list(slices)
+
+            new_slices[i] = new_data_slice
 
-        if all(
-                old_data_slice is new_data_slice
-                for old_data_slice, new_data_slice in new_data_slices.values()
-        ):
+        if new_slices is None:
             return self
 
-        new_data = {}
+        changes = {}
 
-        for _, new_data_slice in new_data_slices.values():
-            new_data.update(vars(new_data_slice))
+        for (_, field_names), data_slice, new_data_slice in zip(
+                self.reducers.values(), slices, new_slices):
+            if new_data_slice is not data_slice:
+                changes.update(
+                    (key, getattr(new_data_slice, key))
+                    for key in field_names
+                )
 
-        return type(self)(**new_data)
+        new_data = dataclasses.replace(self, **changes)
+        object.__setattr__(new_data, '_slices', tuple(new_slices))
+        return new_data
@@ -1,26 +1,70 @@
+import collections
+import functools
+
 __all__ = 'selector',
 
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+_no_state = object()
+
 
-def selector(*input_selectors):
+def selector(*input_selectors, maxsize=16):
+    """Memoize func on the identity of what the input selectors return.
+
+    Up to maxsize results are kept, least recently used first out, so
+    callers alternating between states, or states that differ only in slices
+    func does not look at, reuse earlier results. The cache holds on to the
+    inputs, so an id in it always means the same object."""
     def decorator(func):
-        cache_state = None
+        cache = collections.OrderedDict()
+        hits = 0
+        misses = 0
+        cache_state = _no_state
         cache_result = None
 
+        @functools.wraps(func)
         def wrapper(state):
-            nonlocal cache_state, cache_result
+            nonlocal hits, misses, cache_state, cache_result
 
             if state is cache_state:
+                hits += 1
                 return cache_result
-            else:
-                cache_state = state
 
-            args = (
+            args = tuple(
                 input_selector(state)
                 for input_selector in input_selectors
             )
-            cache_result = func(*args)
+            key = tuple(map(id, args))
+            entry = cache.get(key)
+
+            if entry is None:
+                misses += 1
+                entry = args, func(*args)
+                cache[key] = entry
+
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            else:
+                hits += 1
+                cache.move_to_end(key)
+
+            cache_state = state
+            cache_result = entry[1]
             return cache_result
 
+        def cache_info():
+            return CacheInfo(hits, misses, maxsize, len(cache))
+
+        def cache_clear():
+            nonlocal hits, misses, cache_state, cache_result
+            cache.clear()
+            hits = misses = 0
+            cache_state = _no_state
+            cache_result = None
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
         return wrapper
 
     return decorator
@@ -9,7 +9,9 @@ store = redux.Store(State())
 
 
 def print_state():
-    pprint.pprint(dataclasses.asdict(store.state))
+    # asdict only looks inside lists, not the PersistentStack
+    state = dataclasses.replace(store.state, stack=list(store.state.stack))
+    pprint.pprint(dataclasses.asdict(state))
     print()
 
 
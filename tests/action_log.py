@@ -0,0 +1,126 @@
+import random
+from pyt import actions
+from pyt.Logger import Logger
+from pyt.main.run_terminal.TerminalStore import TerminalStore
+from pyt.main.run_terminal.TerminalStore.Terminal import Terminal
+from redux import ActionLog
+from terminal import random_token, terminal_state
+
+snapshot_intervals = 1, 3, 7, 50
+
+
+class Count:
+    """State that counts the actions reduced into it, which are the numbers
+    from 0 up."""
+
+    def __init__(self, n_actions=0):
+        self.n_actions = n_actions
+
+    def reduce(self, action):
+        assert action == self.n_actions, (action, self.n_actions)
+        return Count(self.n_actions + 1)
+
+
+def check_log(log, n_actions):
+    # n_actions have been logged, the i-th of them being i
+    interval = log.snapshot_interval
+    assert log.stop == n_actions
+    assert log.start % interval == 0
+    assert len(log.chunks) == len(log) // interval + 1
+
+    if log.maxlen is None:
+        assert log.start == 0
+    else:
+        # At least the last maxlen are kept, and nothing is kept that could
+        # be dropped a whole snapshot interval at a time
+        assert len(log) >= min(n_actions, log.maxlen)
+        assert len(log) < log.maxlen + 2 * interval
+        assert log.start == 0 \
+            or len(log) - len(log.chunks[-1][1]) - interval < log.maxlen
+
+    assert list(log) == list(range(log.start, log.stop))
+
+    for index in range(log.start, log.stop + 1):
+        _, logged_actions = log.seek(index)
+        assert len(logged_actions) < interval
+        assert log.state_at(index).n_actions == index
+
+    for index in log.start - 1, log.stop + 1:
+        try:
+            log.seek(index)
+        except IndexError:
+            pass
+        else:
+            raise AssertionError(f'seek {index} in {log !r}')
+
+
+def test_log(snapshot_interval, maxlen):
+    state = Count()
+    log = ActionLog(state, snapshot_interval, maxlen)
+    check_log(log, 0)
+
+    for action in range(4 * (snapshot_interval + (maxlen or 0)) + 5):
+        state = state.reduce(action)
+        log.append(action, lambda: state)
+        check_log(log, action + 1)
+
+
+def random_actions(rand, n_actions):
+    data = b''
+
+    while len(data) < 64 * n_actions:
+        data += random_token(rand).encode()
+
+    start = 0
+
+    for _ in range(n_actions):
+        size = rand.choice([1, 2, 3, 16, 64])
+        yield actions.PutByteSequence(data[start:start + size])
+        start += size
+
+
+def test_store(rand, in_place, snapshot_interval, maxlen):
+    store = TerminalStore(in_place=in_place, action_log_size=maxlen,
+                          snapshot_interval=snapshot_interval)
+    store.unsub_log_state()
+    terminal = Terminal()
+    expected = [terminal_state(terminal)]
+
+    for action in random_actions(rand, 3 * (snapshot_interval + maxlen)):
+        store.dispatch(action)
+        terminal = terminal.reduce(action)
+        expected.append(terminal_state(terminal))
+
+    log = store.action_log
+    assert log.stop == len(expected) - 1
+    assert log.start > 0 and len(log) >= maxlen
+    n_lines = len(store.state.scrollback)
+
+    for index in range(log.start, log.stop + 1):
+        assert terminal_state(store.state_at(index)) == expected[index], index
+
+    # Replaying leaves the live terminal and its scrollback as they were
+    assert terminal_state(store.state) == expected[-1]
+    assert len(store.state.scrollback) == n_lines
+
+
+def main():
+    Logger.disabled = True
+    rand = random.Random(0)
+
+    for snapshot_interval in snapshot_intervals:
+        for maxlen in None, 1, snapshot_interval // 2 + 1, \
+                snapshot_interval * 3:
+            test_log(snapshot_interval, maxlen)
+
+            if maxlen is None:
+                continue
+
+            for in_place in False, True:
+                test_store(rand, in_place, snapshot_interval, maxlen)
+
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()
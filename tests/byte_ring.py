@@ -0,0 +1,63 @@
+import multiprocessing
+import random
+from pyt.main.ByteRing import ByteRing
+
+# Small and odd sized, so writes wrap around it at every offset
+ring_size = 4099
+stream_size = 1 << 22
+
+
+def stream():
+    rand = random.Random(0)
+    return rand.getrandbits(8 * stream_size).to_bytes(stream_size, 'little')
+
+
+def write_stream(byte_ring, notify_queue):
+    # Like read_master, which tells the consumer after every commit
+    data = memoryview(stream())
+    rand = random.Random(1)
+
+    while data:
+        view = byte_ring.writable(rand.randrange(1, 2 * ring_size))
+        n_bytes = min(len(view), len(data))
+        view[:n_bytes] = data[:n_bytes]
+        view.release()
+
+        if byte_ring.commit(n_bytes):
+            notify_queue.put(None)
+
+        data = data[n_bytes:]
+
+
+def read_stream(byte_ring, notify_queue):
+    expected = stream()
+    rand = random.Random(2)
+    read = bytearray()
+
+    while len(read) < stream_size:
+        notify_queue.get()
+
+        for byte_sequence in byte_ring.read(rand.randrange(1, 2 * ring_size)):
+            start = len(read)
+            read += byte_sequence
+            assert read[start:] == expected[start:len(read)], start
+
+    return read == expected
+
+
+def main():
+    byte_ring = ByteRing(ring_size)
+    notify_queue = multiprocessing.Queue()
+    writer = multiprocessing.Process(target=write_stream,
+                                     args=(byte_ring, notify_queue))
+    writer.start()
+    assert read_stream(byte_ring, notify_queue)
+    writer.join()
+    assert len(byte_ring) == 0
+    byte_ring.close()
+    byte_ring.unlink()
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
+BS = chr(0x08)
 HT = chr(0x09)
 LF = chr(0x0a)
 CR = chr(0x0d)
@@ -0,0 +1,171 @@
+import copy
+import pickle
+import random
+from redux import PersistentMap
+from redux.persistent.PersistentMap import BitmapNode, CollisionNode
+
+
+class Key:
+    """Key with a chosen hash, to force collisions on whole hashes and on
+    their low bits."""
+
+    def __init__(self, name, key_hash):
+        self.name = name
+        self.key_hash = key_hash
+
+    def __hash__(self):
+        return self.key_hash
+
+    def __eq__(self, other):
+        return isinstance(other, Key) and other.name == self.name
+
+    def __repr__(self):
+        return f'Key({self.name !r}, {self.key_hash !r})'
+
+
+key_hashes = 0, 1, -1, 32, 1 << 40, (1 << 63) - 1, -(1 << 63)
+
+
+def random_key(rand):
+    r = rand.random()
+
+    if r < .3:
+        name = rand.randrange(60)
+        return Key(name, key_hashes[name % len(key_hashes)])
+
+    if r < .6:
+        return rand.randrange(-2000, 2000)
+
+    return str(rand.randrange(2000))
+
+
+def check_node(node, is_root=False):
+    # Every node below the root holds at least two leaves, so deletes have
+    # collapsed what they emptied
+    if type(node) is CollisionNode:
+        assert len(node.entries) >= 2, node.entries
+        return len(node.entries)
+
+    assert type(node) is BitmapNode, node
+    assert bin(node.bitmap).count('1') == len(node.entries)
+    n_leaves = 0
+
+    for entry in node.entries:
+        n_leaves += 1 if type(entry) is tuple else check_node(entry)
+
+    assert is_root or n_leaves >= 2, node.entries
+    return n_leaves
+
+
+def check(persistent_map, expected):
+    assert check_node(persistent_map._root, is_root=True) == len(expected)
+    assert len(persistent_map) == len(expected)
+    assert dict(persistent_map.items()) == expected
+    assert persistent_map == expected
+
+    for key, value in expected.items():
+        assert persistent_map[key] is value
+        assert key in persistent_map
+
+    # The same items put in another order give a map shaped differently
+    # wherever hashes collide
+    items = list(expected.items())
+    random.Random(len(items)).shuffle(items)
+    assert persistent_map == PersistentMap(items)
+    assert PersistentMap(items) == persistent_map
+
+
+def test_random(rand, n_steps):
+    persistent_map = PersistentMap()
+    expected = {}
+    versions = []
+
+    for step in range(n_steps):
+        key = random_key(rand)
+
+        if rand.random() < .6:
+            value = rand.random()
+            persistent_map = persistent_map.set(key, value)
+            expected[key] = value
+        elif key in expected:
+            persistent_map = persistent_map.delete(key)
+            del expected[key]
+        else:
+            try:
+                persistent_map.delete(key)
+            except KeyError:
+                pass
+            else:
+                raise AssertionError(f'deleted missing key {key !r}')
+
+            assert persistent_map.get(key, step) == step
+            assert key not in persistent_map
+
+        assert len(persistent_map) == len(expected)
+
+        if step % 997 == 0:
+            check(persistent_map, expected)
+            versions.append((persistent_map, dict(expected)))
+
+    # Older versions are untouched by everything done since
+    for version, version_expected in versions:
+        check(version, version_expected)
+
+    for key in list(expected):
+        persistent_map = persistent_map.delete(key)
+        del expected[key]
+
+    check(persistent_map, expected)
+    assert persistent_map == PersistentMap()
+
+
+def test_large():
+    # Past 32 * 33 items, so there are nodes three levels down
+    expected = {str(i): i for i in range(5000)}
+    persistent_map = PersistentMap(expected)
+    check(persistent_map, expected)
+    changed = persistent_map.set('123', -1)
+    assert changed != persistent_map and persistent_map != changed
+    assert changed.set('123', 123) == persistent_map
+    assert changed.update({'123': 123}) == persistent_map
+    assert persistent_map.set('5', 5) is persistent_map
+    assert persistent_map.delete('5') != persistent_map
+    assert persistent_map.delete('5').set('5', 5) == persistent_map
+    assert pickle.loads(pickle.dumps(persistent_map)) == persistent_map
+    assert copy.copy(persistent_map) is persistent_map
+    assert copy.deepcopy(persistent_map) == persistent_map
+
+
+def test_collisions():
+    keys = [Key(i, 7) for i in range(5)]
+    persistent_map = PersistentMap()
+
+    for key in keys:
+        persistent_map = persistent_map.set(key, key.name)
+
+    check(persistent_map, {key: key.name for key in keys})
+    # A key with another hash next to the collision node splits it off
+    other = Key('other', 7 + (1 << 20))
+    split = persistent_map.set(other, 'other')
+    check(split, {other: 'other', **{key: key.name for key in keys}})
+
+    for key in keys[:-1]:
+        split = split.delete(key)
+
+    check(split, {other: 'other', keys[-1]: keys[-1].name})
+    assert PersistentMap(a=1) == {'a': 1}
+
+
+def main():
+    rand = random.Random(0)
+    test_collisions()
+    test_large()
+
+    for _ in range(4):
+        test_random(rand, 10000)
+
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()
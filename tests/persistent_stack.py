@@ -0,0 +1,93 @@
+import copy
+import pickle
+import random
+from redux import PersistentStack
+
+
+def check(stack, expected):
+    assert len(stack) == len(expected)
+    assert list(stack) == expected
+    assert list(reversed(stack)) == expected[::-1]
+    assert stack == expected
+    assert stack == PersistentStack(expected)
+    assert PersistentStack(expected) == stack
+
+    if expected:
+        assert stack.top is expected[-1]
+        assert stack[-1] is expected[-1]
+        assert stack[0] is expected[0]
+        assert stack[1:-1] == expected[1:-1]
+
+
+def test_random(rand, n_steps):
+    stack = PersistentStack()
+    expected = []
+    versions = []
+
+    for step in range(n_steps):
+        if rand.random() < .55 or not expected:
+            item = rand.random()
+            stack = stack.push(item)
+            expected.append(item)
+        else:
+            stack = stack.pop()
+            expected.pop()
+
+        if step % 97 == 0:
+            check(stack, expected)
+            versions.append((stack, expected[:]))
+
+    # Older versions are untouched by everything done since
+    for version, version_expected in versions:
+        check(version, version_expected)
+
+    # Versions that share a tail compare equal or not by their tops
+    base = stack.push(1).push(2)
+    assert base.pop().push(2) == base
+    assert base.pop().push(3) != base
+
+    for index in -len(expected) - 1, len(expected):
+        try:
+            stack[index]
+        except IndexError:
+            pass
+        else:
+            raise AssertionError(f'index {index} of {len(expected)} items')
+
+
+def test_empty():
+    stack = PersistentStack()
+    check(stack, [])
+
+    for method in PersistentStack.pop, lambda stack: stack.top:
+        try:
+            method(stack)
+        except IndexError:
+            pass
+        else:
+            raise AssertionError('empty stack did not raise')
+
+
+def test_deep():
+    # Deep enough that anything recursing once per item would fail
+    items = list(range(100_000))
+    stack = PersistentStack(items)
+    assert pickle.loads(pickle.dumps(stack)) == stack
+    assert copy.copy(stack) is stack
+    assert copy.deepcopy(stack) == stack
+    assert stack == items
+
+
+def main():
+    rand = random.Random(0)
+    test_empty()
+    test_deep()
+
+    for _ in range(20):
+        test_random(rand, 2000)
+
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+import copy
+import pickle
+import random
+from redux import PersistentVector
+
+# Where the trie gains a level: a full tail plus 32, 32 ** 2 and 32 ** 3
+# items in the trie
+edges = 0, 1, 31, 32, 33, 64, 65, 1056, 1057, 33824, 33825
+
+
+def check(vector, expected):
+    assert len(vector) == len(expected)
+    assert list(vector) == expected
+    assert vector == expected
+    # Built in one go, the trie has to come out the same shape
+    assert vector == PersistentVector(expected)
+    assert PersistentVector(expected) == vector
+
+    for index in range(0, len(expected), max(len(expected) // 50, 1)):
+        assert vector[index] is expected[index]
+        assert vector[index - len(expected)] is expected[index]
+
+
+def test_edges():
+    for n in edges:
+        items = list(range(n))
+        appended = PersistentVector()
+
+        for item in items:
+            appended = appended.append(item)
+
+        check(appended, items)
+        check(PersistentVector(items), items)
+        popped = PersistentVector(items + list(range(100)))
+
+        for _ in range(100):
+            popped = popped.pop()
+
+        check(popped, items)
+
+        for index in -n - 1, n:
+            try:
+                popped[index]
+            except IndexError:
+                pass
+            else:
+                raise AssertionError(f'index {index} of {n} items')
+
+
+def test_random(rand, n_steps):
+    vector = PersistentVector()
+    expected = []
+    versions = []
+
+    for step in range(n_steps):
+        r = rand.random()
+
+        if r < .55 or not expected:
+            item = rand.random()
+            vector = vector.append(item)
+            expected.append(item)
+        elif r < .8:
+            vector = vector.pop()
+            expected.pop()
+        else:
+            index = rand.randrange(-len(expected), len(expected))
+            item = rand.random()
+            vector = vector.set(index, item)
+            expected[index] = item
+
+        if step % 997 == 0:
+            check(vector, expected)
+            versions.append((vector, expected[:]))
+
+    # Older versions are untouched by everything done since
+    for version, version_expected in versions:
+        check(version, version_expected)
+
+    while expected:
+        vector = vector.pop()
+        expected.pop()
+
+    check(vector, expected)
+
+    try:
+        vector.pop()
+    except IndexError:
+        pass
+    else:
+        raise AssertionError('popped empty vector')
+
+
+def test_versions():
+    vector = PersistentVector(range(5000))
+    changed = vector.set(3000, -1)
+    assert changed != vector and vector != changed
+    assert changed.set(3000, 3000) == vector
+    assert vector.set(10, vector[10]) is vector
+    assert vector[10:20] == list(range(10, 20))
+    assert pickle.loads(pickle.dumps(vector)) == vector
+    assert copy.copy(vector) is vector
+    assert copy.deepcopy(vector) == vector
+
+
+def main():
+    rand = random.Random(0)
+    test_edges()
+    test_versions()
+
+    for _ in range(4):
+        test_random(rand, 50000)
+
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()
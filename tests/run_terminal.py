@@ -0,0 +1,67 @@
+import io
+import multiprocessing
+import queue
+import time
+import pyt.config
+from pyt import actions
+from pyt.Logger import Logger
+from pyt.main.ByteRing import ByteRing
+from pyt.main.run_terminal import run_terminal
+
+flood_seconds = 3
+line = b'The quick brown fox jumps over the lazy dog. ' * 2 + b'\r\n'
+
+
+def flood(byte_ring, action_queue):
+    # Like read_master, with the shell printing as fast as it can
+    data = line * (io.DEFAULT_BUFFER_SIZE // len(line))
+
+    while True:
+        if byte_ring.write(data):
+            action_queue.put(actions.ReadByteRing())
+
+
+def test_flood():
+    # Frames keep reaching the window while the ring never runs dry
+    byte_ring = ByteRing(pyt.config.byte_ring_size)
+    action_queue = multiprocessing.Queue()
+    terminal_queue = multiprocessing.Queue()
+    quit_event = multiprocessing.Event()
+    proc = run_terminal(terminal_queue, multiprocessing.Event(),
+                        action_queue, multiprocessing.Queue(), quit_event,
+                        byte_ring)
+    producer = multiprocessing.Process(target=flood,
+                                       args=(byte_ring, action_queue))
+    producer.start()
+    frame_times = []
+    end = time.monotonic() + flood_seconds
+
+    while time.monotonic() < end:
+        try:
+            terminal_queue.get(timeout=end - time.monotonic())
+        except queue.Empty:
+            break
+
+        frame_times.append(time.monotonic())
+
+    quit_event.set()
+    action_queue.put(actions.Quit())
+    proc.join()
+    producer.terminate()
+    producer.join()
+    byte_ring.close()
+    byte_ring.unlink()
+    assert len(frame_times) >= 10 * flood_seconds, len(frame_times)
+    gaps = [b - a for a, b in zip(frame_times, frame_times[1:])]
+    assert max(gaps) < .5, max(gaps)
+    return len(frame_times), max(gaps)
+
+
+def main():
+    Logger.disabled = True
+    n_frames, max_gap = test_flood()
+    print(f'ok, {n_frames} frames, largest gap {max_gap * 1000:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+import pickle
+import queue
+import random
+import threading
+import pyt.config
+from pyt import actions
+from pyt.Logger import Logger
+from pyt.main.run_terminal.TerminalStore import TerminalStore
+from chars import ESC, RIS
+from terminal import control_sequence, random_token
+
+keyframe_intervals = 0, 1, 60
+
+
+def screen_state(grid, cursor):
+    return [list(row) for row in grid], grid.scroll_count, cursor
+
+
+def random_string(rand):
+    height = pyt.config.height
+    tokens = []
+
+    for _ in range(rand.randrange(30)):
+        r = rand.random()
+
+        if r < .1:
+            tokens.append(ESC + RIS)
+        elif r < .2:
+            tokens.append(control_sequence(
+                'S', rand.choice([height - 1, height, height + 1,
+                                  3 * height])))
+        else:
+            tokens.append(random_token(rand))
+
+    return ''.join(tokens)
+
+
+def test_store(rand, in_place):
+    store = TerminalStore(terminal_queue=queue.Queue(),
+                          redraw_event=threading.Event(), in_place=in_place)
+    # States are queued at random points below instead of after every
+    # dispatch
+    store.unsub_queue_state()
+    store.unsub_log_state()
+    screen = None
+    expected = []
+
+    for _ in range(300):
+        data = random_string(rand).encode()
+        start = 0
+
+        while start < len(data):
+            size = rand.choice([1, 3, 64, 4096])
+            store.dispatch(actions.PutByteSequence(data[start:start + size]))
+            start += size
+
+            if rand.random() < .3:
+                store.queue_state()
+                expected.append(screen_state(store.state.grid,
+                                             store.state.cursor))
+
+        if rand.random() < .5:
+            continue
+
+        # The window drains whatever has been queued, some of it pickled
+        # on the way like multiprocessing.Queue does
+        while expected:
+            delta = store.terminal_queue.get(block=False)
+
+            if rand.random() < .5:
+                delta = pickle.loads(pickle.dumps(delta))
+
+            screen = delta.apply(screen)
+            result = screen_state(screen.grid, screen.cursor)
+            assert result == expected.pop(0)
+
+        assert store.terminal_queue.empty()
+
+
+def main():
+    Logger.disabled = True
+    rand = random.Random(0)
+
+    for keyframe_interval in keyframe_intervals:
+        pyt.config.keyframe_interval = keyframe_interval
+
+        for in_place in False, True:
+            test_store(rand, in_place)
+
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import collections
+from redux import selector
+
+State = collections.namedtuple('State', 'a b')
+calls = []
+
+
+@selector(lambda state: state.a, lambda state: state.b, maxsize=3)
+def select(a, b):
+    calls.append((a, b))
+    return a + b
+
+
+def check(state, hits, misses, currsize):
+    n_misses = select.cache_info().misses
+    n_calls = len(calls)
+    assert select(state) == state.a + state.b
+    info = select.cache_info()
+    assert info == (hits, misses, 3, currsize), info
+    # Only a miss calls the function
+    assert len(calls) - n_calls == misses - n_misses
+
+
+def test_lru():
+    # Input identities, each a list so equal ones are still told apart
+    inputs = [[i] for i in range(4)]
+    b = ['b']
+    state = State(inputs[0], b)
+    check(state, 0, 1, 1)
+    # The same state again, and another state with the same inputs
+    check(state, 1, 1, 1)
+    check(State(inputs[0], b), 2, 1, 1)
+    check(State([0], b), 2, 2, 2)
+    check(State(inputs[1], b), 2, 3, 3)
+    # Looking inputs[0] up again leaves [0] the least recently used, so it
+    # is the one dropped
+    check(State(inputs[0], b), 3, 3, 3)
+    check(State(inputs[2], b), 3, 4, 3)
+    check(State(inputs[1], b), 4, 4, 3)
+    check(State(inputs[3], b), 4, 5, 3)
+    check(State(inputs[0], b), 4, 6, 3)
+    check(State(inputs[1], b), 5, 6, 3)
+    state = State(inputs[2], b)
+    check(state, 5, 7, 3)
+
+    select.cache_clear()
+    assert select.cache_info() == (0, 0, 3, 0)
+    # Not even the last state is remembered
+    check(state, 0, 1, 1)
+    select.cache_clear()
+    hits = misses = 0
+
+    # Alternating more identities than fit misses every time, as many as
+    # fit hits every time once they are in
+    for i in range(20):
+        misses += 1
+        check(State(inputs[i % 4], b), hits, misses, min(misses, 3))
+
+    for i in range(20):
+        if i < 3:
+            misses += 1
+        else:
+            hits += 1
+
+        check(State(inputs[i % 3], b), hits, misses, 3)
+
+
+def test_ids():
+    # Inputs freed as soon as they are evicted have their ids reused, which
+    # must not turn up an entry for an object that is gone
+    select.cache_clear()
+
+    for i in range(1000):
+        state = State([i], ['b'])
+        assert select(state) == [i, 'b']
+        assert calls[-1] == (state.a, state.b)
+
+    assert select.cache_info() == (0, 1000, 3, 3)
+
+
+def main():
+    test_lru()
+    test_ids()
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import multiprocessing
+import pyt.config
+from pyt import actions
+from pyt.Logger import Logger
+from pyt.main.SharedScreen import SharedScreen
+from pyt.main.run_terminal.TerminalStore.Terminal import Terminal
+
+n_frames = 3000
+
+
+def frame(i):
+    # Every cell of frame i holds the same letter, and the cursor ends up
+    # on the same row each time
+    letter = b'AB'[i % 2:i % 2 + 1]
+    return b'\x1b[H' + letter * (pyt.config.width * pyt.config.height)
+
+
+def write_frames(shared_screen):
+    terminal = Terminal()
+
+    for i in range(n_frames):
+        terminal = terminal.reduce(actions.PutByteSequence(frame(i)))
+        shared_screen.write(terminal)
+
+
+def main():
+    Logger.disabled = True
+    shared_screen = SharedScreen(pyt.config.width, pyt.config.height)
+    assert shared_screen.read() is None
+    writer = multiprocessing.Process(target=write_frames,
+                                     args=(shared_screen,))
+    writer.start()
+    n_reads = 0
+    last_screen = None
+
+    while writer.is_alive():
+        screen = shared_screen.read()
+
+        if screen is None:
+            continue
+
+        n_reads += 1
+        last_screen = screen
+        cells = {code_point for row in screen.grid for code_point in row}
+        assert len(cells) == 1 and cells <= {ord('A'), ord('B')}, cells
+
+    writer.join()
+    expected = Terminal().reduce(actions.PutByteSequence(frame(n_frames - 1)))
+    screen = shared_screen.read() or last_screen
+    assert list(screen.grid) == list(expected.grid)
+    assert screen.cursor == expected.cursor
+    assert shared_screen.read() is None
+    shared_screen.close()
+    shared_screen.unlink()
+    print(f'ok, {n_reads} reads')
+
+
+if __name__ == '__main__':
+    main()
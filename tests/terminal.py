@@ -0,0 +1,277 @@
+import contextlib
+import io
+import random
+import pyt.config
+from pyt import actions
+from pyt.Logger import Logger
+from pyt.main.run_terminal.TerminalStore.Terminal import Terminal
+from chars import BS, CR, CSI, ESC, HT, HTS, LF, RIS, SEP
+import character_tabulation
+import cursor_character_absolute
+import cursor_forward_tabulation
+import line_feed
+import line_position_absolute
+import tabulation_clear
+
+golden = (
+    character_tabulation, cursor_character_absolute,
+    cursor_forward_tabulation, line_feed, line_position_absolute,
+    tabulation_clear,
+)
+
+
+class Reference:
+    """One code point at a time through a plain list-of-lists screen, for
+    the sequences the generators below use."""
+
+    def __init__(self):
+        self.width = pyt.config.width
+        self.height = pyt.config.height
+        self.tab_width = pyt.config.tab_width
+        self.reset()
+
+    def reset(self):
+        self.screen = [[0] * self.width for _ in range(self.height)]
+        self.x = 0
+        self.y = 0
+        self.tabs = set(range(0, self.width, self.tab_width))
+        self.mode = 'char'
+        self.params = ''
+
+    def move(self, x=None, y=None):
+        if x is not None:
+            self.x = min(max(x, 0), self.width)
+
+        if y is not None:
+            self.y = min(max(y, 0), self.height - 1)
+
+    def scroll_up(self, n_lines):
+        for _ in range(min(n_lines, self.height)):
+            del self.screen[0]
+            self.screen.append([0] * self.width)
+
+    def line_feed(self):
+        if self.y == self.height - 1:
+            self.scroll_up(1)
+        else:
+            self.y += 1
+
+        self.x = 0
+
+    def erase(self, y, start=0, end=None):
+        if end is None:
+            end = self.width
+
+        for x in range(max(start, 0), min(end, self.width)):
+            self.screen[y][x] = 0
+
+    def forward_tabulation(self, n_tabs=None):
+        if n_tabs == 0 or self.x == self.width:
+            return
+
+        if n_tabs is None:
+            n_tabs = 1
+
+        next_tabs = sorted(tab for tab in self.tabs if tab > self.x)
+
+        if n_tabs > len(next_tabs):
+            self.move(x=self.width - 1)
+        else:
+            self.move(x=next_tabs[n_tabs - 1])
+
+    def csi(self, final):
+        args = [int(arg) if arg else None for arg in self.params.split(SEP)]
+        arg = args[0]
+        n = 1 if arg is None else arg
+
+        if final == 'A':
+            self.move(y=self.y - n)
+        elif final == 'B':
+            self.move(y=self.y + n)
+        elif final == 'C':
+            self.move(x=self.x + n)
+        elif final == 'D':
+            self.move(x=self.x - n)
+        elif final == 'G':
+            self.move(x=n - 1)
+        elif final == 'H':
+            line, col = (args + [None])[:2]
+            self.move(x=(col or 1) - 1, y=(line or 1) - 1)
+        elif final == 'I':
+            self.forward_tabulation(arg)
+        elif final == 'J':
+            if not arg:
+                self.erase(self.y, self.x)
+                rows = range(self.y + 1, self.height)
+            elif arg == 1:
+                self.erase(self.y, 0, self.x + 1)
+                rows = range(self.y)
+            elif arg == 2:
+                rows = range(self.height)
+            else:
+                rows = ()
+
+            for y in rows:
+                self.erase(y)
+        elif final == 'K':
+            if not arg:
+                self.erase(self.y, self.x)
+            elif arg == 1:
+                self.erase(self.y, 0, self.x + 1)
+            elif arg == 2:
+                self.erase(self.y)
+        elif final == 'S':
+            self.scroll_up(n)
+        elif final == 'X':
+            self.erase(self.y, self.x, self.x + n)
+        elif final == 'd':
+            self.move(y=n - 1)
+        elif final == 'g':
+            if not arg:
+                self.tabs.discard(self.x)
+            elif arg in (3, 5):
+                self.tabs.clear()
+
+    def put(self, char):
+        if self.mode == 'esc':
+            self.mode = 'char'
+
+            if char == CSI:
+                self.mode = 'csi'
+                self.params = ''
+            elif char == HTS:
+                self.tabs.add(self.x)
+            elif char == RIS:
+                self.reset()
+            elif char == ']':
+                self.mode = 'string'
+        elif self.mode == 'csi':
+            if '0' <= char <= '?':
+                self.params += char
+            else:
+                self.mode = 'char'
+                self.csi(char)
+        elif self.mode == 'string':
+            if char == '\a':
+                self.mode = 'char'
+        elif char == ESC:
+            self.mode = 'esc'
+        elif char in (LF, '\v', '\f'):
+            self.line_feed()
+        elif char == CR:
+            self.move(x=0)
+        elif char == BS:
+            self.move(x=self.x - 1)
+        elif char == HT:
+            self.forward_tabulation()
+        elif char >= ' ':
+            if self.x == self.width:
+                self.line_feed()
+
+            self.screen[self.y][self.x] = ord(char)
+            self.x += 1
+
+    def state(self):
+        return self.screen, (self.x, self.y), sorted(self.tabs)
+
+
+def terminal_state(terminal):
+    screen = [list(row) for row in terminal.grid]
+    cursor = terminal.cursor.x, terminal.cursor.y
+    return screen, cursor, sorted(terminal.tabs)
+
+
+def control_sequence(final, *args):
+    return ESC + CSI + SEP.join(map(str, args)) + final
+
+
+def random_token(rand):
+    width = pyt.config.width
+    height = pyt.config.height
+    r = rand.random()
+
+    if r < .3:
+        return ''.join(
+            chr(rand.choice([rand.randrange(0x20, 0x7f), 0xe9, 0x65e5]))
+            for _ in range(rand.choice([1, 5, width - 3, 2 * width + 7]))
+        )
+
+    if r < .55:
+        return rand.choice([LF, LF * rand.randrange(height * 2), CR,
+                            CR + LF, '\v', '\f', BS, HT, '\a'])
+
+    if r < .65:
+        return rand.choice([ESC + HTS, ESC + RIS, ESC + ']0;title\a'])
+
+    arg = rand.choice([None, 0, 1, 2, 3, 5, width // 2, height + 3,
+                       width + 10])
+    final = rand.choice('ABCDGHIJKSXdgm')
+
+    if final == 'H':
+        return control_sequence(final, *(
+            '' if a is None else a
+            for a in (arg, rand.choice([None, 1, width // 3, width + 1]))
+        ))
+
+    if final == 'S' and arg is not None:
+        arg = min(arg, height + 3)
+
+    return control_sequence(final, '' if arg is None else arg)
+
+
+def random_chunks(rand, data):
+    start = 0
+
+    while start < len(data):
+        size = rand.choice([1, 2, 3, 64, 500, 4096])
+        yield data[start:start + size]
+        start += size
+
+
+def test_case(string, rand):
+    data = string.encode()
+    reference = Reference()
+
+    for char in string:
+        reference.put(char)
+
+    copied = Terminal()
+    in_place = Terminal()
+
+    for chunk in random_chunks(rand, data):
+        action = actions.PutByteSequence(chunk)
+        copied = copied.reduce(action)
+        in_place = in_place.reduce_in_place(action)
+
+    expected = reference.state()
+
+    for terminal in copied, in_place:
+        result = terminal_state(terminal)
+        assert result == expected, (string, result, expected)
+
+
+def golden_output(module):
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output):
+        module.main()
+
+    return output.getvalue()
+
+
+def main():
+    Logger.disabled = True
+    rand = random.Random(0)
+
+    for module in golden:
+        test_case(golden_output(module), rand)
+
+    for _ in range(2000):
+        string = ''.join(random_token(rand) for _ in range(rand.randrange(60)))
+        test_case(string, rand)
+
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()
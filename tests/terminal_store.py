@@ -0,0 +1,56 @@
+import queue
+import threading
+import time
+import pyt.config
+from pyt import actions
+from pyt.Logger import Logger
+from pyt.main.SharedScreen import SharedScreen
+from pyt.main.run_terminal.TerminalStore import TerminalStore
+
+
+def settle(store, max_frames=10):
+    # What run_terminal does while no actions come in
+    for n_frames in range(max_frames):
+        timeout = store.frame_timeout()
+
+        if timeout is None:
+            return n_frames
+
+        time.sleep(timeout)
+        store.queue_state()
+
+    raise AssertionError('frames keep coming while idle')
+
+
+def test_idle(**kwargs):
+    store = TerminalStore(redraw_event=threading.Event(), fps=60, **kwargs)
+
+    for _ in range(10):
+        store.dispatch(actions.PutByteSequence(b'ab'))
+
+    n_frames = settle(store)
+    # The first dispatch is queued right away, the rest are one pending
+    # frame
+    assert n_frames == 1, n_frames
+    store.redraw_event.clear()
+    time.sleep(2 * store.frame_interval)
+    assert store.frame_timeout() is None
+    assert not store.redraw_event.is_set()
+
+
+def main():
+    Logger.disabled = True
+    test_idle(terminal_queue=queue.Queue())
+    shared_screen = SharedScreen(pyt.config.width, pyt.config.height)
+
+    try:
+        test_idle(shared_screen=shared_screen)
+    finally:
+        shared_screen.close()
+        shared_screen.unlink()
+
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()
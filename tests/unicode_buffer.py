@@ -0,0 +1,97 @@
+import random
+from pyt.main.run_terminal.TerminalStore.Terminal.TerminalActions \
+    .TerminalBase.UnicodeBuffer import (
+        UnicodeBuffer, decode, encode, get_n_bytes,
+    )
+
+malformed = [
+    b'\x80', b'\xbf', b'\xc0\xaf', b'\xc1\xbf', b'\xf5\x80\x80\x80', b'\xff',
+    b'\xe0\x80\xaf', b'\xed\xa0\x80', b'\xf0\x80\x80\xaf', b'\xf4\x90\x80\x80',
+    b'\xe3\x41\x42', b'\xc3', b'\xe3\x81', b'\xf0\x9f\x98',
+]
+
+
+def reference(unicode_bytes):
+    # One sequence at a time with the decode helper
+    decoded = []
+
+    while unicode_bytes:
+        n_bytes = get_n_bytes(unicode_bytes[0]) or 1
+
+        if n_bytes > len(unicode_bytes):
+            break
+
+        try:
+            decoded.append(chr(decode(unicode_bytes[:n_bytes])))
+        except UnicodeError:
+            decoded.append('\ufffd')
+
+        unicode_bytes = unicode_bytes[n_bytes:]
+
+    return ''.join(decoded), unicode_bytes
+
+
+def test_case(unicode_bytes, chunk_sizes):
+    unicode_buffer = UnicodeBuffer()
+    decoded = []
+    start = 0
+
+    for size in chunk_sizes:
+        decoded.append(
+            unicode_buffer.add_bytes(unicode_bytes[start:start + size]))
+        start += size
+
+    expected = reference(unicode_bytes)
+    result = ''.join(decoded), unicode_buffer.unicode_buffer
+    assert result == expected, (unicode_bytes, chunk_sizes, result, expected)
+
+
+def random_bytes(rand):
+    pieces = []
+
+    for _ in range(rand.randrange(50)):
+        if rand.random() < .2:
+            pieces.append(rand.choice(malformed))
+        else:
+            code_point = rand.choice([0x7f, 0x7ff, 0xffff, 0x10ffff])
+            code_point = rand.randrange(code_point + 1)
+
+            if 0xd800 <= code_point < 0xe000:
+                continue
+
+            pieces.append(bytes(encode(code_point)))
+
+    return b''.join(pieces)
+
+
+def random_chunk_sizes(rand, length):
+    sizes = []
+
+    while length > 0:
+        sizes.append(rand.randrange(1, 8))
+        length -= sizes[-1]
+
+    return sizes
+
+
+def main():
+    for code_point in range(0x110000):
+        if not 0xd800 <= code_point < 0xe000:
+            unicode_bytes = bytes(encode(code_point))
+            test_case(unicode_bytes, [len(unicode_bytes)])
+            test_case(unicode_bytes, [1] * len(unicode_bytes))
+
+    for unicode_bytes in malformed:
+        test_case(unicode_bytes, [len(unicode_bytes)])
+
+    rand = random.Random(0)
+
+    for _ in range(10000):
+        unicode_bytes = random_bytes(rand)
+        test_case(unicode_bytes, random_chunk_sizes(rand, len(unicode_bytes)))
+
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()